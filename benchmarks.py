@@ -0,0 +1,523 @@
+"""Medições de desempenho do caminho de dados.
+
+Carga do DataFrame (``python benchmarks.py dataframe finance.db``): compara
+a montagem antiga (``fetchall`` de tuplas copiado para ``pd.DataFrame``) com
+a leitura em blocos de ``get_transactions_dataframe``. Resultado em um banco
+de 1.000.000 de transações, no ambiente de desenvolvimento:
+
+    ==========================================  =========  ===============
+    Método                                      Tempo (s)  Pico de memória
+    ==========================================  =========  ===============
+    fetchall + DataFrame                        2.4        398 MiB
+    get_transactions_dataframe                  2.7        139 MiB
+    get_transactions_dataframe (amount, type)   1.3        28 MiB
+    ==========================================  =========  ===============
+
+A carga completa leva praticamente o mesmo tempo, mas já entrega as datas
+como ``datetime64`` e o tipo como categoria (a montagem antiga deixa ambos
+como texto), com cerca de um terço da memória.
+
+O pico de memória é medido com ``tracemalloc`` (alocações do Python e do
+NumPy) e inclui o DataFrame resultante.
+
+Inicialização da linha de comando (``python benchmarks.py startup``):
+mediana do tempo total de cada subcomando de ``python -m cli`` em um banco
+pequeno. Antes das importações sob demanda, só importar controllers, views
+e utils levava cerca de 1,3 s.
+
+    ==================================  ==========
+    Comando                             Tempo (ms)
+    ==================================  ==========
+    python (sem importações)            18
+    importar views (interface gráfica)  171
+    cli add / query / export / import   52-59
+    cli balance                         66
+    cli report (carrega pandas)         643
+    ==================================  ==========
+
+Suíte de regressão: ``python benchmarks.py generate ledger_1m.db 1000000``
+cria um banco sintético reprodutível, e ``python benchmarks.py suite
+ledger_10k.db ledger_1m.db --output antes.json`` mede cada operação em um
+processo próprio, gravando tempo de parede e pico de RSS em JSON; ``python
+benchmarks.py compare antes.json depois.json`` mostra a razão entre duas
+execuções. Nada disso usa o Tk. Resultados no ambiente de desenvolvimento
+(o RSS inclui NumPy e pandas já importados, cerca de 104 MiB, e as páginas
+do banco mapeadas pelo ``mmap``):
+
+    ============================  ===============  ===============
+    Operação                      10 mil linhas    1 milhão
+    ============================  ===============  ===============
+    get_balance                   0.001 s, 104 MiB 0.001 s, 105 MiB
+    get_transactions              0.027 s, 109 MiB 2.4 s, 600 MiB
+    get_transactions_dataframe    0.046 s, 121 MiB 3.3 s, 516 MiB
+    filtro por data (um mês)      0.003 s, 106 MiB 0.19 s, 255 MiB
+    generate_report (mensal)      0.013 s, 109 MiB 0.043 s, 116 MiB
+    resumo por categoria          0.003 s, 107 MiB 0.17 s, 301 MiB
+    add_transaction (1000 vezes)  0.25 s, 106 MiB  0.94 s, 152 MiB
+    ============================  ===============  ===============
+
+Importação em lote (``python benchmarks.py import [linhas]``): grava um
+extrato sintético de 200 mil linhas em texto, em ordem cronológica, com
+``import_transactions`` em um banco vazio e falha se a taxa ficar abaixo de
+``IMPORT_TARGET_ROWS_PER_SECOND``; vale a mediana de ``--repeat``
+importações (3, por padrão). No ambiente de desenvolvimento (uma CPU, tempos
+variando cerca de 10% entre execuções) a taxa fica entre 55 e 65 mil
+linhas/s; antes de os índices e gatilhos de inserção serem removidos e
+recriados no fim, ficava perto de 20 mil. Os totais e o índice de busca das
+linhas importadas são completados com uma instrução cada, no fim, e o
+índice de busca não tem índices de prefixo. O tempo se divide assim:
+
+    ========================================  =========
+    Etapa (200 mil linhas)                    Tempo (s)
+    ========================================  =========
+    validação (``Transaction.validate``)      0.6
+    INSERT das linhas, sem índices            0.9
+    índice de busca (FTS5)                    0.35
+    recriação dos índices                     0.9
+    totais, agregados mensais e commit        0.5
+    ========================================  =========
+
+Em um banco que já tem 1 milhão de transações, importar 300 mil leva cerca
+de 20 s (15 mil linhas/s), dominado pela recriação dos índices; mantendo-os,
+levaria 24 s. Abaixo de ``controllers.BULK_IMPORT_FRACTION`` os índices são
+mantidos.
+
+O banco de 10 milhões de linhas (``generate ledger_10m.db 10000000``) não
+cabe na memória do ambiente de desenvolvimento para ``get_transactions``;
+use ``--operation`` para medir só as operações que não carregam tudo.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from controllers import FinancialController
+from database import insert_transactions
+
+
+def measure(func, *args, **kwargs):
+    """Executa ``func`` duas vezes, medindo o tempo e o pico de memória.
+
+    O ``tracemalloc`` torna cada alocação bem mais lenta, por isso o tempo é
+    medido em uma execução sem rastreamento e o pico de memória em outra.
+
+    Returns:
+        tuple: (resultado, segundos, pico em bytes).
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _legacy_dataframe(controller):
+    import pandas as pd
+
+    transactions = controller.get_transactions()
+    return pd.DataFrame(transactions, columns=["id", "date", "description", "amount", "type"])
+
+
+def bench_dataframe(db_file):
+    """Compara as formas de carregar as transações em um DataFrame.
+
+    Args:
+        db_file (str): Banco de dados a ser lido.
+
+    Returns:
+        list: Tuplas (método, linhas, segundos, pico em bytes).
+    """
+    controller = FinancialController(db_file)
+    cases = (
+        ("fetchall + DataFrame", lambda: _legacy_dataframe(controller)),
+        ("get_transactions_dataframe", lambda: controller.get_transactions_dataframe()),
+        ("get_transactions_dataframe (amount, type)",
+         lambda: controller.get_transactions_dataframe(["amount", "type"])),
+    )
+    results = []
+    for name, func in cases:
+        df, elapsed, peak = measure(func)
+        results.append((name, len(df), elapsed, peak))
+        del df
+    controller.close()
+    return results
+
+
+def _wall_time(command, repeat):
+    """Mediana do tempo de parede de ``repeat`` execuções do comando."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def bench_startup(repeat=5):
+    """Mede o tempo total de cada subcomando de ``python -m cli``.
+
+    Os comandos rodam em um banco temporário pequeno, então o tempo medido
+    é praticamente o de inicialização do interpretador, das importações e
+    da abertura do banco.
+
+    Args:
+        repeat (int): Execuções de cada comando; vale a mediana.
+
+    Returns:
+        list: Tuplas (comando, segundos).
+    """
+    python = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "startup.db")
+        csv_path = os.path.join(tmp, "export.csv")
+        cli = [python, "-m", "cli", "--db", db]
+        subprocess.run(cli + ["add", "2024-01-05", "Salário", "5000", "Receita"], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        cases = (
+            ("python (sem importações)", [python, "-c", "pass"]),
+            ("importar views (interface gráfica)", [python, "-c", "import views"]),
+            ("cli add", cli + ["add", "2024-01-06", "Mercado", "10", "Despesa"]),
+            ("cli query", cli + ["query", "--limit", "10"]),
+            ("cli balance", cli + ["balance"]),
+            ("cli export (csv)", cli + ["export", csv_path]),
+            ("cli import (csv)", cli + ["import", csv_path]),
+            ("cli report", cli + ["report"]),
+        )
+        return [(name, _wall_time(command, repeat)) for name, command in cases]
+
+
+# Estabelecimentos usados nas descrições sintéticas, com o peso e a categoria de cada um
+_MERCHANTS = (
+    ("Supermercado Pão de Açúcar", 12, "Mercado"), ("Padaria São João", 10, "Alimentação"),
+    ("Posto Ipiranga", 6, "Transporte"), ("Uber Viagem", 9, "Transporte"), ("iFood Pedido", 9, "Alimentação"),
+    ("Farmácia Drogasil", 5, "Saúde"), ("Restaurante Sabor Caseiro", 6, "Alimentação"),
+    ("Netflix Assinatura", 1, "Assinaturas"), ("Conta de Luz Enel", 1, "Moradia"),
+    ("Conta de Água Sabesp", 1, "Moradia"), ("Aluguel Apartamento", 1, "Moradia"),
+    ("Academia Smart Fit", 1, "Saúde"), ("Amazon Compra", 4, "Compras"), ("Mercado Livre", 4, "Compras"),
+    ("Transferência PIX", 8, "Transferências"), ("Saque Banco 24 Horas", 2, "Transferências"),
+    ("Cinema Cinemark", 2, "Lazer"), ("Livraria Cultura", 1, "Educação"),
+)
+_INCOME_SOURCES = (
+    ("Salário ACME Ltda", "Salário"), ("Freelance Projeto", "Renda Extra"), ("Rendimento Poupança", "Rendimentos"),
+    ("Reembolso", "Reembolsos"), ("PIX Recebido", "Transferências"),
+)
+# Contas: receitas caem na conta corrente; despesas, em sua maioria, no cartão
+_ACCOUNTS = ("Conta Corrente", "Cartão de Crédito")
+_CARD_SHARE = 0.6
+
+def generate_ledger(path, rows, seed=42, years=5, chunk_size=100000):
+    """Cria (ou completa) um banco com transações sintéticas realistas.
+
+    As datas cobrem os ``years`` anos até hoje, em ordem cronológica (como
+    num banco real, ids maiores são mais recentes), com menos movimento nos
+    fins de semana. Cerca de 8% das transações são receitas, concentradas
+    nos dias 5 e 20 (salários), com valores log-normais em torno de
+    R$ 3.000; as despesas são log-normais em torno de R$ 60. Cada
+    transação recebe a categoria do estabelecimento (ou da fonte de
+    receita) e uma conta.
+
+    Args:
+        path (str): Arquivo do banco a ser criado.
+        rows (int): Quantidade de transações.
+        seed (int): Semente do gerador, para bancos reproduzíveis.
+        years (int): Anos cobertos pelas datas.
+        chunk_size (int): Transações gravadas por transação do banco.
+
+    Returns:
+        int: Quantidade de transações gravadas.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    end = datetime.date.today()
+    start = end - datetime.timedelta(days=365 * years)
+    days = np.arange(np.datetime64(start), np.datetime64(end) + 1)
+    weekday = (days.astype(np.int64) + 3) % 7
+    day_of_month = (days - days.astype("datetime64[M]")).astype(np.int64) + 1
+    expense_weights = np.where(weekday >= 5, 0.6, 1.0)
+    income_weights = 0.2 + 8.0 * np.isin(day_of_month, (5, 20))
+
+    income = rng.random(rows) < 0.08
+    dates = np.empty(rows, dtype="datetime64[D]")
+    dates[~income] = rng.choice(days, size=int((~income).sum()), p=expense_weights / expense_weights.sum())
+    dates[income] = rng.choice(days, size=int(income.sum()), p=income_weights / income_weights.sum())
+    order = np.argsort(dates, kind="stable")
+    dates, income = dates[order], income[order]
+    amounts = np.where(income, rng.lognormal(np.log(3000), 0.5, rows), rng.lognormal(np.log(60), 1.0, rows))
+    # Em centavos, como são gravados
+    amounts = np.rint(np.clip(amounts, 1.0, 50000.0) * 100).astype(np.int64)
+
+    names, weights, merchant_categories = zip(*_MERCHANTS)
+    weights = np.array(weights, dtype=np.float64)
+    merchant = rng.choice(len(names), size=rows, p=weights / weights.sum())
+    source = rng.integers(0, len(_INCOME_SOURCES), size=rows)
+    reference = rng.integers(1, 10000, size=rows)
+    card = ~income & (rng.random(rows) < _CARD_SHARE)
+
+    controller = FinancialController(path, synchronous="OFF")
+    written = 0
+    try:
+        categories = {name: controller.add_category(name)
+                      for name in merchant_categories + tuple(category for _, category in _INCOME_SOURCES)}
+        checking, credit_card = (controller.add_account(name) for name in _ACCOUNTS)
+        for offset in range(0, rows, chunk_size):
+            part = slice(offset, offset + chunk_size)
+            batch = [
+                (str(day), _INCOME_SOURCES[src][0] if is_income else f"{names[m]} {ref}",
+                 int(amount), "Receita" if is_income else "Despesa",
+                 categories[_INCOME_SOURCES[src][1] if is_income else merchant_categories[m]],
+                 credit_card if on_card else checking)
+                for day, is_income, amount, m, src, ref, on_card in zip(
+                    dates[part], income[part], amounts[part], merchant[part], source[part], reference[part],
+                    card[part])
+            ]
+            with controller.db.transaction() as conn:
+                written += insert_transactions(conn, batch) or 0
+    finally:
+        controller.close()
+    return written
+
+
+IMPORT_TARGET_ROWS_PER_SECOND = 50000
+"""Taxa mínima de ``import_transactions`` em um banco vazio, em linhas por segundo."""
+
+def _statement_rows(rows, seed=42, years=5):
+    """Linhas de um extrato sintético, como ``importers`` as entrega.
+
+    Em ordem cronológica, como nos extratos dos bancos, com datas, valores
+    e tipos em texto.
+    """
+    import random
+
+    rng = random.Random(seed)
+    names = [name for name, _, _ in _MERCHANTS]
+    weights = [weight for _, weight, _ in _MERCHANTS]
+    start = datetime.date.today() - datetime.timedelta(days=365 * years)
+    days = sorted(rng.randrange(365 * years) for _ in range(rows))
+    for day in days:
+        date = (start + datetime.timedelta(days=day)).isoformat()
+        if rng.random() < 0.08:
+            yield date, _INCOME_SOURCES[rng.randrange(len(_INCOME_SOURCES))][0], \
+                f"{rng.lognormvariate(8.0, 0.5):.2f}", "Receita"
+        else:
+            name = rng.choices(names, weights)[0]
+            yield date, f"{name} {rng.randrange(1, 10000)}", f"{rng.lognormvariate(4.1, 1.0):.2f}", "Despesa"
+
+def bench_import(rows=200000, batch_size=None):
+    """Mede ``import_transactions`` gravando um extrato em um banco vazio.
+
+    As linhas são geradas antes da medição, então o tempo é o de validação
+    e gravação (índices, totais e índice de busca incluídos), com o
+    ``synchronous`` padrão do controlador.
+
+    Args:
+        rows (int): Quantidade de linhas importadas.
+        batch_size (int, optional): Linhas por lote; por padrão, o do
+            controlador.
+
+    Returns:
+        tuple: (linhas inseridas, segundos).
+    """
+    statement = list(_statement_rows(rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        controller = FinancialController(os.path.join(tmp, "import.db"))
+        try:
+            kwargs = {} if batch_size is None else {"batch_size": batch_size}
+            start = time.perf_counter()
+            inserted, _ = controller.import_transactions(statement, **kwargs)
+            elapsed = time.perf_counter() - start
+        finally:
+            controller.close()
+    return inserted, elapsed
+
+
+def _peak_rss():
+    """Pico de memória residente do processo atual, em bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # O Linux informa em KiB; o macOS, em bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _month_range(controller):
+    """Um mês com movimento no meio do banco, para o filtro por data."""
+    first, last = controller.conn.execute("SELECT MIN(date), MAX(date) FROM transactions").fetchone()
+    middle = datetime.date.fromisoformat(first) + (datetime.date.fromisoformat(last)
+                                                   - datetime.date.fromisoformat(first)) / 2
+    start = middle.replace(day=1)
+    end = (start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+def _bench_add(controller, count=1000):
+    ids = [controller.add_transaction("2024-01-15", "Benchmark", 1.0, "Despesa") for _ in range(count)]
+    return ids
+
+# Operações medidas pela suíte; cada uma roda em um processo próprio para
+# que o pico de memória (RSS) seja só dela
+OPERATIONS = {
+    "get_balance": lambda controller: controller.get_balance(),
+    "get_transactions": lambda controller: controller.get_transactions(),
+    "get_transactions_dataframe": lambda controller: controller.get_transactions_dataframe(),
+    "filter_by_date": lambda controller: controller.query_transactions(*_month_range(controller)),
+    "generate_report": lambda controller: controller.generate_report("month"),
+    "summarize_by_category": lambda controller: controller.summarize_by_category(),
+    "add_transaction (1000)": _bench_add,
+}
+
+def run_operation(db_file, operation):
+    """Mede uma operação no processo atual.
+
+    O RSS inclui as páginas do banco lidas pelo ``mmap`` da conexão, então
+    consultas que percorrem muitos dados mostram um pico maior que o dos
+    objetos Python que produzem.
+
+    Returns:
+        dict: Tempo de parede, pico de RSS e RSS antes da operação.
+    """
+    # O custo das importações fica com o benchmark de inicialização
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+    controller = FinancialController(db_file)
+    func = OPERATIONS[operation]
+    baseline = _peak_rss()
+    start = time.perf_counter()
+    result = func(controller)
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss()
+    if operation.startswith("add_transaction"):
+        # Remove o que a medição gravou, para não alterar o banco de referência
+        controller.delete_transactions(result)
+    controller.close()
+    return {"seconds": elapsed, "peak_rss_mib": peak / 2**20, "baseline_rss_mib": baseline / 2**20}
+
+def run_suite(databases, output, operations=None):
+    """Mede cada operação em cada banco e grava os resultados em JSON.
+
+    Args:
+        databases (list): Caminhos dos bancos (por exemplo os de 10 mil,
+            1 milhão e 10 milhões de transações).
+        output (str): Arquivo JSON de saída.
+        operations (list, optional): Operações a medir; por padrão, todas
+            de ``OPERATIONS``.
+
+    Returns:
+        dict: O conteúdo gravado.
+    """
+    operations = operations or list(OPERATIONS)
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for db_file in databases:
+        with sqlite3.connect(db_file) as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        for operation in operations:
+            completed = subprocess.run(
+                [sys.executable, os.path.join(here, "benchmarks.py"), "run", db_file, operation],
+                capture_output=True, text=True, cwd=here)
+            if completed.returncode != 0:
+                result = {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr else "falhou"}
+            else:
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+            result.update(db=db_file, rows=rows, operation=operation)
+            results.append(result)
+            print(_format_result(result), flush=True)
+    data = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    return data
+
+def _format_result(result, previous=None):
+    line = f"{result['rows']:>10} linhas  {result['operation']:28}"
+    if "error" in result:
+        return f"{line} erro: {result['error']}"
+    line += f" {result['seconds']:9.3f} s {result['peak_rss_mib']:9.1f} MiB"
+    if previous and "seconds" in previous:
+        line += f"  ({result['seconds'] / previous['seconds']:.2f}x o tempo anterior)"
+    return line
+
+def compare(old_file, new_file):
+    """Mostra os resultados de ``new_file`` com a razão de tempo em relação a ``old_file``."""
+    with open(old_file, encoding="utf-8") as f:
+        old = {(r["rows"], r["operation"]): r for r in json.load(f)["results"]}
+    with open(new_file, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+    for result in new:
+        print(_format_result(result, old.get((result["rows"], result["operation"]))))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Medições de desempenho do caminho de dados.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dataframe = commands.add_parser("dataframe", help="Compara as cargas de DataFrame")
+    dataframe.add_argument("db")
+    commands.add_parser("startup", help="Mede a inicialização de python -m cli")
+    importing = commands.add_parser("import", help="Mede a importação em lote em um banco vazio")
+    importing.add_argument("rows", type=int, nargs="?", default=200000)
+    importing.add_argument("--repeat", type=int, default=3, help="Importações medidas; vale a mediana")
+    importing.add_argument("--target", type=float, default=IMPORT_TARGET_ROWS_PER_SECOND,
+                           help="Taxa mínima, em linhas por segundo; abaixo dela o comando falha")
+    generate = commands.add_parser("generate", help="Cria um banco sintético")
+    generate.add_argument("db")
+    generate.add_argument("rows", type=int)
+    generate.add_argument("--seed", type=int, default=42)
+    generate.add_argument("--years", type=int, default=5)
+    suite = commands.add_parser("suite", help="Mede as operações principais e grava um JSON")
+    suite.add_argument("databases", nargs="+")
+    suite.add_argument("--output", default="benchmark_results.json")
+    suite.add_argument("--operation", action="append", choices=list(OPERATIONS), dest="operations")
+    comparison = commands.add_parser("compare", help="Compara dois JSONs da suíte")
+    comparison.add_argument("old")
+    comparison.add_argument("new")
+    run = commands.add_parser("run", help=argparse.SUPPRESS)
+    run.add_argument("db")
+    run.add_argument("operation", choices=list(OPERATIONS))
+    args = parser.parse_args()
+
+    if args.command == "dataframe":
+        for name, rows, elapsed, peak in bench_dataframe(args.db):
+            print(f"{name:45} {rows:>10} linhas {elapsed:8.2f} s {peak / 2**20:10.1f} MiB")
+    elif args.command == "startup":
+        for name, elapsed in bench_startup():
+            print(f"{name:40} {elapsed * 1000:8.0f} ms")
+    elif args.command == "import":
+        results = [bench_import(args.rows) for _ in range(args.repeat)]
+        inserted = results[0][0]
+        elapsed = statistics.median(elapsed for _, elapsed in results)
+        rate = inserted / elapsed
+        print(f"{inserted} transações importadas em {elapsed:.2f} s ({rate:,.0f} linhas/s)")
+        if rate < args.target:
+            sys.exit(f"Abaixo da meta de {args.target:,.0f} linhas/s.")
+    elif args.command == "generate":
+        start = time.perf_counter()
+        written = generate_ledger(args.db, args.rows, args.seed, args.years)
+        print(f"{written} transações gravadas em {time.perf_counter() - start:.1f} s")
+    elif args.command == "suite":
+        run_suite(args.databases, args.output, args.operations)
+    elif args.command == "compare":
+        compare(args.old, args.new)
+    elif args.command == "run":
+        # Só o JSON vai para a saída padrão; mensagens do banco vão para stderr
+        stdout, sys.stdout = sys.stdout, sys.stderr
+        result = run_operation(args.db, args.operation)
+        sys.stdout = stdout
+        print(json.dumps(result))
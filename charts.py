@@ -0,0 +1,149 @@
+"""Dados e desenho dos gráficos do dashboard.
+
+Cada gráfico de ``CHARTS`` tem duas partes: uma função que calcula os dados
+a partir do controlador, executada fora da thread do Tk (pelo
+``workers.BackgroundWorker``) e que devolve só o que será desenhado, e uma
+função que desenha esses dados em um ``Axes`` do matplotlib, executada na
+thread do Tk. Nenhuma delas usa o ``pyplot``, que guarda estado global e
+não é seguro entre threads; ``utils`` usa as mesmas funções para exibir os
+gráficos fora da interface.
+
+Séries temporais longas são reduzidas à largura do gráfico em pixels por
+``downsample`` antes de chegar ao matplotlib.
+"""
+from models import Money
+
+# O NumPy só é importado pelas funções que o usam, já que o dashboard importa
+# este módulo ao iniciar
+
+MONTHLY_BAR_WIDTH = 12
+"""Largura mínima, em pixels, de cada mês no gráfico de receitas e despesas."""
+
+BREAKDOWN_LIMIT = 8
+"""Quantidade de barras do gráfico por categoria; as demais são somadas em "Outras"."""
+
+def downsample(x, y, width):
+    """Reduz uma série à quantidade de pontos que a largura consegue mostrar.
+
+    Os pontos são divididos em ``width`` colunas (uma por pixel) e, de cada
+    coluna, ficam só o menor e o maior valor, na ordem original; o primeiro
+    e o último ponto da série também são mantidos. O desenho resultante é o
+    mesmo da série completa, já que cada coluna de pixels mostra só o trecho
+    entre o mínimo e o máximo dela.
+
+    Args:
+        x (np.ndarray): Valores do eixo horizontal, em ordem crescente.
+        y (np.ndarray): Valores da série, do mesmo tamanho de ``x``.
+        width (int): Largura do gráfico, em pixels.
+
+    Returns:
+        tuple: (x, y) com no máximo ``2 * width + 2`` pontos; a própria série
+            se ela já couber.
+    """
+    import numpy as np
+
+    size = len(y)
+    if width <= 0 or size <= 2 * width:
+        return x, y
+    columns = np.arange(size, dtype=np.int64) * width // size
+    # Ordena por coluna e, dentro dela, por valor: o primeiro de cada coluna
+    # é o mínimo e o último, o máximo
+    order = np.lexsort((y, columns))
+    starts = np.searchsorted(columns[order], np.arange(width))
+    ends = np.append(starts[1:], size) - 1
+    keep = np.unique(np.concatenate((order[starts], order[ends], [0, size - 1])))
+    return x[keep], y[keep]
+
+def balance_data(controller, width):
+    """Calcula o saldo acumulado dia a dia, reduzido à largura do gráfico.
+
+    A série vem dos totais diários (``get_daily_balance``), então o custo
+    depende da quantidade de dias com movimento, e não de transações.
+
+    Args:
+        controller (FinancialController): Controlador com as transações.
+        width (int): Largura do gráfico, em pixels.
+
+    Returns:
+        tuple: (datas como ``datetime64``, saldos em reais).
+    """
+    dates, balances = controller.get_daily_balance()
+    return downsample(dates, balances / 100, width)
+
+def draw_balance(ax, data):
+    """Desenha o saldo acumulado calculado por ``balance_data``."""
+    dates, balances = data
+    ax.plot(dates, balances, linewidth=1)
+    ax.set_title("Saldo acumulado")
+    ax.set_ylabel("R$")
+    ax.grid(True, alpha=0.3)
+
+def monthly_data(controller, width):
+    """Calcula receitas e despesas dos meses que cabem na largura do gráfico.
+
+    Usa o relatório mensal, que lê os meses fechados dos agregados
+    mensais; só os últimos meses, com ao menos ``MONTHLY_BAR_WIDTH`` pixels
+    cada, são devolvidos.
+
+    Args:
+        controller (FinancialController): Controlador com as transações.
+        width (int): Largura do gráfico, em pixels.
+
+    Returns:
+        tuple: (meses como ``datetime64``, receitas, despesas), em reais.
+    """
+    report = controller.generate_report("month")
+    report = report.iloc[-max(width // MONTHLY_BAR_WIDTH, 1):]
+    return report.index.to_numpy(), report["Receita"].to_numpy(), report["Despesa"].to_numpy()
+
+def draw_monthly(ax, data):
+    """Desenha as barras de receitas e despesas calculadas por ``monthly_data``."""
+    import numpy as np
+
+    months, income, expenses = data
+    positions = np.arange(len(months))
+    ax.bar(positions - 0.2, income, width=0.4, label="Receitas", color="tab:green")
+    ax.bar(positions + 0.2, expenses, width=0.4, label="Despesas", color="tab:red")
+    step = max(len(months) // 12, 1)
+    ax.set_xticks(positions[::step], [str(month)[:7] for month in months[::step]], rotation=45, ha="right")
+    ax.set_title("Receitas e despesas por mês")
+    ax.set_ylabel("R$")
+    ax.legend()
+
+def breakdown_data(controller, by="category", type="Despesa", limit=BREAKDOWN_LIMIT, **filters):
+    """Calcula os totais por categoria (ou conta), agrupados pelo SQLite.
+
+    Args:
+        controller (FinancialController): Controlador com as transações.
+        by (str): "category" ou "account".
+        type (str): Tipo de transação considerado (Receita/Despesa).
+        limit (int): Quantidade de grupos; os restantes são somados em "Outras".
+        **filters: Filtros de período e valores repassados ao controlador.
+
+    Returns:
+        list: Pares (nome, total como ``Money``), do maior para o menor.
+    """
+    if by == "category":
+        rows = controller.summarize_by_category(type=type, **filters)
+        missing = "Sem categoria"
+    else:
+        rows = controller.summarize_by_account(type=type, **filters)
+        missing = "Sem conta"
+    bars = [(name or missing, total) for _, name, _, total, _ in rows]
+    if len(bars) > limit:
+        others = sum((total for _, total in bars[limit - 1:]), Money(0))
+        bars = bars[:limit - 1] + [("Outras", others)]
+    return bars
+
+def draw_breakdown(ax, bars, title="Despesas por categoria"):
+    """Desenha as barras horizontais calculadas por ``breakdown_data``."""
+    ax.barh([name for name, _ in reversed(bars)], [total / 100 for _, total in reversed(bars)])
+    ax.set_title(title)
+    ax.set_xlabel("Valor (R$)")
+
+CHARTS = {
+    "Saldo": (balance_data, draw_balance),
+    "Mensal": (monthly_data, draw_monthly),
+    "Categorias": (lambda controller, width: breakdown_data(controller), draw_breakdown),
+}
+"""Gráficos do painel: nome -> (cálculo dos dados, desenho)."""
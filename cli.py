@@ -0,0 +1,335 @@
+"""Interface de linha de comando, sem interface gráfica.
+
+Uso: ``python -m cli [--db finance.db] [--timing] <comando> ...``, com os
+comandos add, import, query, balance, breakdown, report, export e recurring
+(``--help`` em cada um lista as opções). Só o necessário para cada comando é importado: pandas
+e NumPy apenas em report e nas exportações colunares, e nunca o Tk ou o
+matplotlib.
+
+A saída de cada comando vai para a saída padrão; as mensagens do
+controlador e do banco, para a saída de erros, e uma mensagem de erro faz o
+código de saída ser 1.
+
+Com ``--timing``, o tempo de inicialização (importações e abertura do
+banco) e o do comando são mostrados na saída de erros; com ``--stats``, o
+tempo de cada chamada ao controlador e ao banco e as instruções SQL lentas
+(ver ``instrumentation``).
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import contextlib
+import csv
+import sqlite3
+import sys
+
+from models import FREQUENCIES, TRANSACTION_TYPES, Money, RecurringRule, Transaction, normalize_date
+
+DEFAULT_DB = "finance.db"
+
+class _Abort(Exception):
+    """Desfaz o ``controller.batch()`` de um comando cujo passo falhou.
+
+    O controlador já informou o erro na saída de erros.
+    """
+
+class _Diagnostics:
+    """Saída de erros que registra se o controlador informou algum erro.
+
+    O controlador e o banco informam erros com ``print`` e devolvem um
+    valor vazio; durante os comandos essas mensagens vão para a saída de
+    erros, e uma mensagem de erro torna o código de saída diferente de zero.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.failed = False
+
+    def write(self, text):
+        if text.startswith("Erro"):
+            self.failed = True
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def _amount(text):
+    """Tipo do argparse para valores em reais, convertidos para ``Money``."""
+    try:
+        return Money.from_value(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+def _filters(args):
+    """Monta os filtros de consulta a partir das opções comuns."""
+    filters = {
+        "start_date": normalize_date(args.start) if args.start else None,
+        "end_date": normalize_date(args.end) if args.end else None,
+        "type": args.type,
+    }
+    for name in ("description", "min_amount", "max_amount"):
+        if getattr(args, name, None) is not None:
+            filters[name] = getattr(args, name)
+    return {name: value for name, value in filters.items() if value is not None}
+
+# Rótulo das transações sem categoria ou sem conta em breakdown
+_MISSING_LABELS = {"category": "(sem categoria)", "account": "(sem conta)"}
+
+def _references(controller, args):
+    """Cadastra (ou encontra) a categoria e a conta informadas pelo nome.
+
+    Raises:
+        _Abort: Se um dos nomes for inválido.
+    """
+    category_id = controller.add_category(args.category) if args.category else None
+    account_id = controller.add_account(args.account) if args.account else None
+    if (args.category and category_id is None) or (args.account and account_id is None):
+        raise _Abort()
+    return category_id, account_id
+
+def cmd_add(controller, args, out):
+    """Adiciona uma transação e mostra o id gerado.
+
+    Categoria e conta são informadas pelo nome e cadastradas se ainda não
+    existirem, na mesma transação do banco: se a transação for recusada,
+    nada é cadastrado.
+    """
+    try:
+        with controller.batch():
+            category_id, account_id = _references(controller, args)
+            transaction_id = controller.add_transaction(args.date, args.description, args.amount, args.type,
+                                                        category_id, account_id)
+            if transaction_id is None:
+                raise _Abort()
+    except _Abort:
+        return 1
+    print(transaction_id, file=out)
+    return 0
+
+def cmd_import(controller, args, out):
+    """Importa um arquivo e mostra as linhas rejeitadas na saída de erros."""
+    inserted, rejects = controller.import_file(args.path, args.batch_size)
+    for position, row, message in rejects:
+        print(f"Linha {position} rejeitada: {message} {row}", file=sys.stderr)
+    print(f"{inserted} transação(ões) importada(s), {len(rejects)} rejeitada(s).", file=out)
+    return 1 if rejects and not inserted else 0
+
+def cmd_query(controller, args, out):
+    """Lista as transações filtradas em CSV, em ordem de id."""
+    filters = _filters(args)
+    writer = csv.writer(out, delimiter=args.delimiter, lineterminator="\n")
+    writer.writerow(Transaction._fields)
+    rows = controller.iter_transactions(**filters)
+    if args.limit is not None:
+        rows = (row for _, row in zip(range(args.limit), rows))
+    writer.writerows(rows)
+    return 0
+
+def cmd_balance(controller, args, out):
+    """Mostra saldo, receitas e despesas (dos filtros, se houver)."""
+    filters = _filters(args)
+    if filters:
+        summary = controller.summarize_transactions(**filters)
+        receitas = summary.get("Receita", (Money(0), 0))[0]
+        despesas = summary.get("Despesa", (Money(0), 0))[0]
+    else:
+        receitas = controller.get_total_income()
+        despesas = controller.get_total_expenses()
+    print(f"Saldo: R$ {receitas - despesas:.2f}", file=out)
+    print(f"Receitas: R$ {receitas:.2f}", file=out)
+    print(f"Despesas: R$ {despesas:.2f}", file=out)
+    return 0
+
+def cmd_breakdown(controller, args, out):
+    """Mostra soma e quantidade por categoria (ou conta) e tipo."""
+    filters = _filters(args)
+    if args.by == "category":
+        rows = controller.summarize_by_category(**filters)
+    else:
+        rows = controller.summarize_by_account(**filters)
+    for _, name, type, total, count in rows:
+        print(f"{type:<8} {name or _MISSING_LABELS[args.by]:<30} R$ {total:>14.2f} {count:>9}", file=out)
+    return 0
+
+def cmd_report(controller, args, out):
+    """Mostra o fluxo líquido e o saldo acumulado por período."""
+    report = controller.generate_report(args.period, **_filters(args))
+    if args.csv:
+        report.to_csv(out, lineterminator="\n")
+    else:
+        print(report.to_string(), file=out)
+    return 0
+
+def cmd_export(controller, args, out):
+    """Exporta as transações e mostra a marca d'água da próxima exportação."""
+    count, watermark = controller.export_transactions(args.path, since_id=args.since_id, **_filters(args))
+    print(f"{count} transação(ões) exportada(s). Próximo --since-id: {watermark if watermark is not None else 0}",
+          file=out)
+    return 0
+
+def cmd_recurring_add(controller, args, out):
+    """Cadastra uma transação recorrente e mostra o id da regra.
+
+    Como em ``cmd_add``, categoria e conta só são cadastradas com a regra.
+    """
+    try:
+        with controller.batch():
+            category_id, account_id = _references(controller, args)
+            rule_id = controller.add_recurring_rule(args.description, args.amount, args.type, args.every,
+                                                    args.start, args.interval, args.end, category_id, account_id)
+            if rule_id is None:
+                raise _Abort()
+    except _Abort:
+        return 1
+    print(rule_id, file=out)
+    return 0
+
+def cmd_recurring_list(controller, args, out):
+    """Lista as transações recorrentes em CSV."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(RecurringRule._fields)
+    writer.writerows(controller.get_recurring_rules())
+    return 0
+
+def cmd_recurring_delete(controller, args, out):
+    """Remove uma transação recorrente."""
+    if not controller.delete_recurring_rule(args.id):
+        print(f"Transação recorrente {args.id} não encontrada.", file=sys.stderr)
+        return 1
+    return 0
+
+def cmd_recurring_run(controller, args, out):
+    """Gera as transações recorrentes devidas e mostra quantas foram geradas."""
+    created = controller.run_recurring_rules(args.until)
+    if created is None:
+        return 1
+    print(f"{created} transação(ões) gerada(s).", file=out)
+    return 0
+
+def _add_filter_options(parser, full=False):
+    """Adiciona as opções de filtro; ``full`` inclui descrição e valores."""
+    parser.add_argument("--start", help="Data inicial (AAAA-MM-DD ou DD/MM/AAAA)")
+    parser.add_argument("--end", help="Data final, inclusiva")
+    parser.add_argument("--type", choices=TRANSACTION_TYPES, help="Tipo da transação")
+    if full:
+        parser.add_argument("--description", help="Trecho contido na descrição")
+        parser.add_argument("--min-amount", type=_amount, help="Valor mínimo, em reais")
+        parser.add_argument("--max-amount", type=_amount, help="Valor máximo, em reais")
+
+def build_parser():
+    """Cria o parser de argumentos com todos os subcomandos."""
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Controle financeiro pela linha de comando.")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"Arquivo do banco de dados (padrão: {DEFAULT_DB})")
+    parser.add_argument("--timing", action="store_true", help="Mostra os tempos de inicialização e do comando")
+    parser.add_argument("--stats", action="store_true", help="Mostra o tempo das chamadas e as instruções SQL lentas")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Adiciona uma transação")
+    add.add_argument("date", help="Data (AAAA-MM-DD ou DD/MM/AAAA)")
+    add.add_argument("description")
+    add.add_argument("amount", help="Valor em reais (por exemplo, 1234.56)")
+    add.add_argument("type", choices=TRANSACTION_TYPES)
+    add.add_argument("--category", help="Nome da categoria (cadastrada se não existir)")
+    add.add_argument("--account", help="Nome da conta (cadastrada se não existir)")
+    add.set_defaults(func=cmd_add)
+
+    import_ = commands.add_parser("import", help="Importa um arquivo CSV, OFX, Parquet ou Arrow")
+    import_.add_argument("path")
+    import_.add_argument("--batch-size", type=int, default=10000, help="Linhas por transação do banco")
+    import_.set_defaults(func=cmd_import)
+
+    query = commands.add_parser("query", help="Lista transações em CSV")
+    _add_filter_options(query, full=True)
+    query.add_argument("--limit", type=int, help="Quantidade máxima de linhas")
+    query.add_argument("--delimiter", default=",", help="Separador de colunas (padrão: ,)")
+    query.set_defaults(func=cmd_query)
+
+    balance = commands.add_parser("balance", help="Mostra saldo, receitas e despesas")
+    _add_filter_options(balance)
+    balance.set_defaults(func=cmd_balance)
+
+    breakdown = commands.add_parser("breakdown", help="Totais por categoria ou conta")
+    breakdown.add_argument("--by", choices=("category", "account"), default="category",
+                           help="Dimensão do agrupamento (padrão: category)")
+    _add_filter_options(breakdown)
+    breakdown.set_defaults(func=cmd_breakdown)
+
+    report = commands.add_parser("report", help="Relatório de fluxo e saldo por período")
+    report.add_argument("--period", choices=("day", "week", "month", "year"), default="month")
+    report.add_argument("--csv", action="store_true", help="Saída em CSV")
+    _add_filter_options(report)
+    report.set_defaults(func=cmd_report)
+
+    export = commands.add_parser("export", help="Exporta transações para CSV, Parquet ou Arrow")
+    export.add_argument("path", help="Arquivo de destino (.csv, .parquet, .arrow ou .feather)")
+    export.add_argument("--since-id", type=int, help="Exporta só transações com id maior (marca d'água)")
+    _add_filter_options(export, full=True)
+    export.set_defaults(func=cmd_export)
+
+    recurring = commands.add_parser("recurring", help="Transações recorrentes (aluguel, salário, assinaturas)")
+    recurring_commands = recurring.add_subparsers(dest="recurring_command", required=True)
+    recurring_add = recurring_commands.add_parser("add", help="Cadastra uma transação recorrente")
+    recurring_add.add_argument("description")
+    recurring_add.add_argument("amount", help="Valor em reais (por exemplo, 1234.56)")
+    recurring_add.add_argument("type", choices=TRANSACTION_TYPES)
+    recurring_add.add_argument("--every", choices=FREQUENCIES, default="monthly",
+                               help="Frequência (padrão: monthly)")
+    recurring_add.add_argument("--interval", type=int, default=1, help="Períodos entre as ocorrências (padrão: 1)")
+    recurring_add.add_argument("--start", required=True, help="Data da primeira ocorrência")
+    recurring_add.add_argument("--end", help="Data após a qual não há ocorrências")
+    recurring_add.add_argument("--category", help="Nome da categoria (cadastrada se não existir)")
+    recurring_add.add_argument("--account", help="Nome da conta (cadastrada se não existir)")
+    recurring_add.set_defaults(func=cmd_recurring_add)
+    recurring_list = recurring_commands.add_parser("list", help="Lista as transações recorrentes em CSV")
+    recurring_list.set_defaults(func=cmd_recurring_list)
+    recurring_delete = recurring_commands.add_parser("delete", help="Remove uma transação recorrente")
+    recurring_delete.add_argument("id", type=int)
+    recurring_delete.set_defaults(func=cmd_recurring_delete)
+    recurring_run = recurring_commands.add_parser("run", help="Gera as transações recorrentes devidas")
+    recurring_run.add_argument("--until", help="Data limite, inclusiva (padrão: hoje)")
+    recurring_run.set_defaults(func=cmd_recurring_run)
+    return parser
+
+def main(argv=None):
+    """Executa a linha de comando.
+
+    Args:
+        argv (list, optional): Argumentos; por padrão, os do processo.
+
+    Returns:
+        int: Código de saída.
+    """
+    args = build_parser().parse_args(argv)
+    if args.stats:
+        import instrumentation
+        instrumentation.enable()
+    out = sys.stdout
+    diagnostics = _Diagnostics(sys.stderr)
+    try:
+        # Mensagens de diagnóstico do banco não devem se misturar à saída,
+        # que os comandos gravam em ``out``
+        with contextlib.redirect_stdout(diagnostics):
+            from controllers import FinancialController
+            controller = FinancialController(args.db)
+            started = time.perf_counter()
+            try:
+                status = args.func(controller, args, out)
+            finally:
+                controller.close()
+            finished = time.perf_counter()
+    except (ValueError, ImportError, OSError, sqlite3.Error) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    if diagnostics.failed:
+        status = status or 1
+    if args.timing:
+        print(f"Inicialização: {(started - _START) * 1000:.0f} ms; comando: {(finished - started) * 1000:.0f} ms",
+              file=sys.stderr)
+    if args.stats:
+        print(instrumentation.format_stats(), file=sys.stderr)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,118 +1,1163 @@
-from database import create_connection, insert_transaction, fetch_transactions, update_transaction, delete_transaction, create_table
-import pandas as pd
+import itertools
+from contextlib import contextmanager
+from datetime import date, timedelta
+from database import (ConnectionManager, insert_transaction, insert_transactions, fetch_transactions, update_transaction, delete_transaction,
+                      create_table, fetch_totals, fetch_daily_net, rebuild_totals, verify_totals, query_transactions,
+                      summarize_transactions, fetch_transactions_page, fetch_transaction, fetch_transactions_by_ids,
+                      delete_transactions, update_transactions, count_transactions, iter_transaction_chunks,
+                      snapshot, data_version, transaction_row, TRANSACTION_COLUMNS, invalidate_rollup,
+                      compute_rollup, store_rollup, refresh_rollup, fetch_rollup, fetch_date_range,
+                      search_transactions, summarize_by_dimension, fetch_dimension, insert_dimension,
+                      delete_dimension, fetch_recurring_rules, insert_recurring_rule, delete_recurring_rule,
+                      materialize_occurrences, drop_indexes, restore_indexes)
+from instrumentation import timed
+from models import (TRANSACTION_TYPES, Money, RecurringRule, Transaction, normalize_date, validate_amount,
+                    validate_reference, validate_type)
+from importers import read_file
+from exporters import SOURCE_COLUMNS, export_format, write_csv, write_columnar
+
+IMPORT_BATCH_SIZE = 10000
+"""Quantidade padrão de linhas validadas e gravadas de cada vez na importação em lote."""
+
+BULK_IMPORT_FRACTION = 0.2
+"""Fração das transações já gravadas a partir da qual uma importação remove os
+índices e os recria no fim, em vez de atualizá-los linha a linha.
+
+Recriar os índices custa proporcionalmente ao tamanho da tabela (cerca de
+12 s em um banco de 1 milhão de transações), e atualizá-los, cerca de 50 µs
+a mais por linha importada nesse banco: empatam perto de 200 mil linhas.
+Como as linhas chegam em fluxo, sem total conhecido, a troca acontece
+quando as já importadas alcançam essa fração; assim uma importação nunca
+custa mais que o dobro do melhor dos dois caminhos."""
+
+EVENT_RELOAD_THRESHOLD = 500
+"""Acima desta quantidade de alterações em um lote, os ouvintes recebem um único "reload"."""
+
+DATAFRAME_CHUNK_SIZE = 65536
+"""Linhas lidas do banco por bloco ao montar o DataFrame."""
+
+# Tipo de cada coluna na conversão dos blocos lidos do banco; datas em
+# ISO-8601 são interpretadas pelo próprio NumPy e valores ficam em centavos.
+# NumPy e pandas só são importados pelos métodos que os usam, para não pesar
+# na inicialização.
+_COLUMN_DTYPES = {"id": "int64", "date": "datetime64[D]", "description": "O", "amount": "int64", "type": "O",
+                  "category_id": "int64", "account_id": "int64"}
+
+# Colunas que podem ser NULL no banco; nos arrays, a ausência vira 0 (os ids
+# começam em 1)
+_NULLABLE_COLUMNS = {"category_id", "account_id"}
+
+# Colunas dos arrays e DataFrames quando nenhuma é pedida
+_DEFAULT_COLUMNS = ("id", "date", "description", "amount", "type")
+
+# Filtros que podem ser respondidos pelos agregados mensais
+_ROLLUP_FILTERS = {"start_date", "end_date", "type"}
+
+def _next_month(month):
+    """Retorna o mês (AAAA-MM) seguinte a ``month``."""
+    year, number = int(month[:4]), int(month[5:7])
+    return f"{year + 1:04d}-01" if number == 12 else f"{year:04d}-{number + 1:02d}"
+
+def _previous_month(month):
+    """Retorna o mês (AAAA-MM) anterior a ``month``."""
+    year, number = int(month[:4]), int(month[5:7])
+    return f"{year - 1:04d}-12" if number == 1 else f"{year:04d}-{number - 1:02d}"
+
+def _day_before(day):
+    """Retorna a data ISO do dia anterior a ``day``."""
+    return (date.fromisoformat(day) - timedelta(days=1)).isoformat()
 
 class FinancialController:
     """Controlador para gerenciar transações financeiras."""
 
-    def __init__(self, db_file):
+    def __init__(self, db_file, journal_mode="WAL", synchronous="NORMAL", cache_size=-65536,
+                 mmap_size=268435456):
         """Inicializa o controlador com uma conexão ao banco de dados.
 
+        Leituras usam uma conexão por thread e escritas passam por uma única
+        conexão serializada (ver ``database.ConnectionManager``), então o
+        mesmo controlador pode ser usado pela interface e por threads em
+        segundo plano.
+
         Args:
             db_file (str): Caminho para o arquivo do banco de dados.
+            journal_mode (str): Modo de journal do SQLite ("WAL" permite ler
+                enquanto outra conexão grava).
+            synchronous (str): PRAGMA synchronous (OFF, NORMAL, FULL ou EXTRA).
+            cache_size (int): PRAGMA cache_size por conexão (negativo em KiB).
+            mmap_size (int): Bytes do arquivo mapeados em memória por conexão.
+
+        Raises:
+            sqlite3.Error: Se o esquema do banco não puder ser criado ou migrado.
         """
-        self.conn = create_connection(db_file)
+        self.db_file = db_file
+        self.db = ConnectionManager(db_file, journal_mode=journal_mode, synchronous=synchronous,
+                                    cache_size=cache_size, mmap_size=mmap_size)
+        self.conn = self.db.writer
+        self._listeners = []
+        self._events = None
+        self._data_version = 0
         if self.conn is not None:
-            create_table(self.conn)
+            try:
+                create_table(self.conn)
+            except Exception:
+                self.db.close()
+                raise
         else:
             print("Erro ao conectar ao banco de dados.")
 
-    def add_transaction(self, date, description, amount, type):
+    def close(self):
+        """Fecha as conexões com o banco de dados."""
+        self.db.close()
+
+    def subscribe(self, callback):
+        """Registra uma função chamada a cada alteração de transações.
+
+        A função recebe ``(action, old, new)``: ``action`` é "add", "update",
+        "delete" ou "reload"; ``old`` e ``new`` são as ``Transaction`` antes
+        e depois da alteração, ou None quando não se aplicam. "reload" indica uma alteração em massa
+        (como uma importação) que exige recarregar os dados.
+
+        Args:
+            callback (callable): Função a ser chamada.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        """Remove uma função registrada com ``subscribe``."""
+        self._listeners.remove(callback)
+
+    @property
+    def data_version(self):
+        """Contador de alterações já gravadas, para invalidar caches.
+
+        Aumenta a cada evento entregue aos assinantes de ``subscribe``, antes
+        de chamá-los; um valor igual ao guardado junto de um cálculo indica
+        que as transações não mudaram desde então.
+        """
+        return self._data_version
+
+    def _notify(self, action, old=None, new=None):
+        if self._events is not None:
+            # Dentro de batch(): os eventos só valem depois do commit
+            self._events.append((action, old, new))
+            return
+        self._data_version += 1
+        for callback in list(self._listeners):
+            callback(action, old, new)
+
+    def _dispatch(self, events):
+        """Entrega os eventos acumulados em um lote já gravado."""
+        if len(events) > EVENT_RELOAD_THRESHOLD or any(action == "reload" for action, _, _ in events):
+            events = [("reload", None, None)]
+        for action, old, new in events:
+            self._notify(action, old, new)
+
+    @contextmanager
+    def batch(self):
+        """Agrupa várias operações de escrita em uma única transação.
+
+        O commit acontece só no fim do bloco mais externo e, se o bloco
+        lançar uma exceção, nada do que foi feito nele é gravado. Blocos
+        aninhados usam SAVEPOINTs. Os eventos de ``subscribe`` são entregues
+        depois do commit; lotes com muitas alterações geram um único "reload".
+
+        Exemplo::
+
+            with controller.batch():
+                controller.add_transaction("2025-03-01", "Aluguel", 1500, "Despesa")
+                controller.delete_transaction(42)
+
+        Yields:
+            sqlite3.Connection: A conexão de escrita, já em transação.
+        """
+        with self.db.transaction() as conn:
+            outermost = self._events is None
+            if outermost:
+                self._events = []
+            mark = len(self._events)
+            try:
+                yield conn
+            except BaseException:
+                if outermost:
+                    self._events = None
+                else:
+                    del self._events[mark:]
+                raise
+            if outermost:
+                events, self._events = self._events, None
+        if outermost:
+            self._dispatch(events)
+
+    @timed()
+    def add_transaction(self, date, description, amount, type, category_id=None, account_id=None):
         """Adiciona uma nova transação.
 
         Args:
-            date (str): Data da transação.
+            date (str): Data da transação (DD/MM/AAAA ou AAAA-MM-DD).
             description (str): Descrição da transação.
-            amount (float): Valor da transação.
+            amount (Money | float | str): Valor da transação, em reais.
             type (str): Tipo da transação (Receita/Despesa).
+            category_id (int, optional): ID da categoria (ver ``add_category``).
+            account_id (int, optional): ID da conta (ver ``add_account``).
 
         Returns:
             int: ID da transação inserida.
         """
         try:
-            amount = float(amount)
-            if amount < 0:
-                raise ValueError("O valor da transação não pode ser negativo.")
-            transaction = (date, description, amount, type)
-            return insert_transaction(self.conn, transaction)
+            values = Transaction.validate(date, description, amount, type, category_id, account_id)
         except ValueError as e:
             print(f"Erro ao adicionar transação: {e}")
             return None
+        with self.batch() as conn:
+            transaction_id = insert_transaction(conn, values)
+            if transaction_id is not None:
+                transaction = Transaction(transaction_id, *values)
+                invalidate_rollup(conn, [(transaction.date, transaction.type)])
+                self._notify("add", None, transaction)
+        return transaction_id
+
+    @timed()
+    def import_transactions(self, transactions, batch_size=IMPORT_BATCH_SIZE, by_name=False):
+        """Importa transações em lote.
+
+        Cada linha é validada com as regras de ``Transaction`` e as válidas são
+        gravadas em lotes de ``batch_size`` linhas. Linhas inválidas são
+        rejeitadas individualmente sem interromper a importação. A
+        importação inteira é uma única transação do banco: as demais
+        conexões só veem as linhas importadas depois do commit.
+
+        Quando a quantidade importada alcança ``BULK_IMPORT_FRACTION`` das
+        transações que já existiam, os índices secundários e os gatilhos de
+        inserção são removidos e recriados uma única vez no fim (ver
+        ``database.drop_indexes``), o que custa proporcionalmente ao tamanho
+        da tabela, em vez de serem atualizados a cada linha; os totais e o
+        índice de busca das linhas importadas também são completados de uma
+        vez, no fim.
+
+        Args:
+            transactions (iterable): Sequências (date, description, amount, type),
+                opcionalmente seguidas de category_id e account_id. Pode ser
+                um gerador; as linhas são consumidas sob demanda.
+            batch_size (int): Quantidade de linhas validadas e gravadas de
+                cada vez.
+            by_name (bool): Se True, categoria e conta vêm pelo nome, como
+                nas exportações; nomes ainda não cadastrados são cadastrados
+                na mesma transação, e nomes vazios ou None deixam a
+                transação sem a referência.
+
+        Returns:
+            tuple: (quantidade inserida, lista de rejeições). Cada rejeição é
+                uma tupla (posição da linha a partir de 1, linha, mensagem).
+        """
+        inserted = 0
+        rejects = []
+        with self.batch() as conn:
+            existing = count_transactions(conn)
+            without_indexes = False
+            start_id = None
+            references = self._references_by_name(conn) if by_name else None
+            for batch, positions in self._validated_batches(transactions, batch_size, rejects, references):
+                if not without_indexes and inserted + len(batch) >= existing * BULK_IMPORT_FRACTION:
+                    start_id = drop_indexes(conn)
+                    without_indexes = True
+                inserted += self._insert_batch(batch, positions, rejects, bulk=without_indexes)
+            if without_indexes:
+                restore_indexes(conn, start_id)
+            if inserted:
+                self._notify("reload")
+        return inserted, rejects
+
+    @staticmethod
+    def _validated_batches(transactions, batch_size, rejects, references=None):
+        """Valida as linhas e as agrupa em lotes de ``batch_size``; as inválidas vão para ``rejects``.
+
+        Com ``references``, o quinto e o sexto campos de cada linha são
+        nomes, trocados pelos ids depois de validados os demais.
+        """
+        batch = []
+        positions = []
+        for position, row in enumerate(transactions, start=1):
+            try:
+                if references is None:
+                    batch.append(Transaction.validate(*row))
+                else:
+                    batch.append(Transaction.validate(*row[:4])[:4] + references(*row[4:6]))
+                positions.append(position)
+            except (TypeError, ValueError) as e:
+                rejects.append((position, row, str(e)))
+                continue
+            if len(batch) >= batch_size:
+                yield batch, positions
+                batch = []
+                positions = []
+        if batch:
+            yield batch, positions
+
+    @staticmethod
+    def _references_by_name(conn):
+        """Cria a função que troca os nomes da categoria e da conta pelos ids.
+
+        Cada nome é procurado (ou cadastrado) uma única vez por importação.
+        """
+        ids = {}
+
+        def reference(dimension, name):
+            name = name.strip() if isinstance(name, str) else ""
+            if not name:
+                return None
+            key = (dimension, name.casefold())
+            if key not in ids:
+                dimension_id = insert_dimension(conn, dimension, name)
+                if dimension_id is None:
+                    raise ValueError(f"Não foi possível cadastrar {name!r}.")
+                ids[key] = dimension_id
+            return ids[key]
+
+        def references(category=None, account=None):
+            return reference("category", category), reference("account", account)
+
+        return references
+
+    def _insert_batch(self, batch, positions, rejects, bulk=False):
+        """Grava um lote validado; se o lote falhar, grava linha a linha.
+
+        As linhas também passam por ``insert_transactions``, que soma os
+        totais e indexa a busca sem depender dos gatilhos de inserção; com
+        ``bulk``, isso fica para ``database.restore_indexes``.
+        """
+        with self.batch() as conn:
+            invalidate_rollup(conn, [(date, type) for date, _, _, type, _, _ in batch])
+            count = insert_transactions(conn, batch, bulk)
+            if count is not None:
+                return count
+            count = 0
+            for position, row in zip(positions, batch):
+                if insert_transactions(conn, [row], bulk) is None:
+                    rejects.append((position, row, "Erro ao gravar a transação no banco de dados."))
+                else:
+                    count += 1
+            return count
+
+    @timed()
+    def import_file(self, path, batch_size=IMPORT_BATCH_SIZE):
+        """Importa um extrato ou exportação, lendo o arquivo em fluxo.
+
+        Categoria e conta, quando o arquivo as tem, são associadas pelo
+        nome (ver ``import_transactions``).
+
+        Args:
+            path (str): Caminho do arquivo (.csv, .ofx, .parquet, .arrow ou
+                .feather).
+            batch_size (int): Quantidade de linhas validadas e gravadas de
+                cada vez.
+
+        Returns:
+            tuple: O mesmo retorno de ``import_transactions``.
+        """
+        return self.import_transactions(read_file(path), batch_size, by_name=True)
+
+    @timed()
+    def export_transactions(self, path, since_id=None, chunk_size=DATAFRAME_CHUNK_SIZE, **filters):
+        """Exporta as transações para CSV, Parquet ou Arrow IPC em fluxo.
+
+        As transações são lidas em blocos de ``chunk_size``, em ordem de id e
+        de uma mesma transação de leitura, e cada bloco é gravado antes da
+        leitura do próximo, então a memória usada não depende do tamanho do
+        banco. O formato é escolhido pela extensão (ver
+        ``exporters.export_format``). Categoria e conta são gravadas pelo
+        nome, e ``import_file`` as cadastra de volta pelo nome.
+
+        Para exportações incrementais, passe como ``since_id`` o id
+        retornado pela exportação anterior: só as transações incluídas
+        depois dela são gravadas. Alterações e remoções de transações já
+        exportadas não são detectadas por essa marca.
+
+        Args:
+            path (str): Arquivo de destino (.csv, .parquet, .arrow ou .feather).
+            since_id (int, optional): Exporta só transações com id maior.
+            chunk_size (int): Linhas lidas do banco por bloco.
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
 
+        Returns:
+            tuple: (quantidade exportada, marca d'água para a próxima
+                exportação incremental).
+        """
+        format = export_format(path)
+        conn = self.db.reader()
+        with snapshot(conn):
+            categories = dict(fetch_dimension(conn, "category"))
+            accounts = dict(fetch_dimension(conn, "account"))
+            if format == "csv":
+                chunks = iter_transaction_chunks(conn, SOURCE_COLUMNS, chunk_size, since_id=since_id, **filters)
+                count, last_id = write_csv(path, chunks, categories, accounts)
+            else:
+                chunks = self.iter_transaction_arrays(SOURCE_COLUMNS, chunk_size, since_id=since_id, **filters)
+                count, last_id = write_columnar(path, chunks, format, categories, accounts)
+        return count, last_id if last_id is not None else since_id
+
+    @timed()
     def get_transactions(self):
         """Recupera todas as transações.
 
         Returns:
-            list: Lista de transações.
+            list: Lista de ``Transaction``.
+        """
+        return fetch_transactions(self.db.reader())
+
+    @timed()
+    def get_transaction(self, transaction_id):
+        """Recupera uma transação pelo ID.
+
+        Args:
+            transaction_id (int): ID da transação.
+
+        Returns:
+            Transaction: A transação, ou None se não existir.
+        """
+        return fetch_transaction(self.db.reader(), transaction_id)
+
+    @timed()
+    def get_transactions_page(self, order_by="id", descending=False, after=None, limit=200, **filters):
+        """Recupera uma página de transações com paginação por chave.
+
+        Args:
+            order_by (str): Coluna de ordenação (id, date, type ou amount).
+            descending (bool): Se True, ordena de forma decrescente.
+            after (tuple, optional): Chave (valor da coluna, id) da última
+                transação já exibida; omitida para a primeira página.
+            limit (int): Quantidade máxima de transações.
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
+        Returns:
+            list: Lista de ``Transaction``.
+        """
+        return fetch_transactions_page(self.db.reader(), order_by, descending, after, limit, **filters)
+
+    @timed()
+    def query_transactions(self, start_date=None, end_date=None, type=None, description=None,
+                           min_amount=None, max_amount=None):
+        """Consulta transações filtradas, com os totais calculados pelo SQLite.
+
+        Args:
+            start_date (str, optional): Data inicial (inclusiva), AAAA-MM-DD.
+            end_date (str, optional): Data final (inclusiva), AAAA-MM-DD.
+            type (str, optional): Tipo da transação (Receita/Despesa).
+            description (str, optional): Trecho contido na descrição.
+            min_amount (Money | float, optional): Valor mínimo, em reais.
+            max_amount (Money | float, optional): Valor máximo, em reais.
+
+        Returns:
+            tuple: (lista de transações, dict tipo -> (soma, quantidade)).
+        """
+        filters = dict(start_date=start_date, end_date=end_date, type=type, description=description,
+                       min_amount=min_amount, max_amount=max_amount)
+        conn = self.db.reader()
+        # Linhas e totais da mesma transação de leitura, para que concordem
+        with snapshot(conn):
+            return query_transactions(conn, **filters), summarize_transactions(conn, **filters)
+
+    @timed()
+    def search(self, text, limit=50, offset=0, **filters):
+        """Busca transações pela descrição no índice de texto, por relevância.
+
+        Todas as palavras do texto precisam aparecer na descrição, sem
+        diferenciar maiúsculas nem acentos; a última vale como prefixo, para
+        buscas enquanto o usuário digita.
+
+        Args:
+            text (str): Texto buscado.
+            limit (int): Quantidade máxima de transações.
+            offset (int): Quantidade de resultados a pular (paginação).
+            **filters: Filtros de ``query_transactions`` (exceto description).
+
+        Returns:
+            list: Lista de ``Transaction``, das mais relevantes para as menos.
+        """
+        return search_transactions(self.db.reader(), text, limit, offset, **filters)
+
+    @timed()
+    def summarize_transactions(self, **filters):
+        """Calcula soma e quantidade por tipo sem recuperar as transações.
+
+        Quando só há filtros de data e tipo, os meses fechados são lidos dos
+        agregados mensais e apenas o restante do intervalo (o mês corrente e
+        meses incompletos nas pontas) é somado a partir das transações.
+
+        Args:
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
+        Returns:
+            dict: Mapeamento tipo -> (soma, quantidade).
+        """
+        conn = self.db.reader()
+        if not self._uses_rollup(filters):
+            return summarize_transactions(conn, **filters)
+        self._refresh_rollup(filters.get("start_date"), filters.get("end_date"), self._rollup_types(filters))
+        with snapshot(conn):
+            return self._summarize_with_rollup(conn, filters)
+
+    def _summarize_with_rollup(self, conn, filters):
+        """Soma por tipo combinando agregados mensais e transações."""
+        first_month, last_month, ranges = self._rollup_plan(conn, filters.get("start_date"), filters.get("end_date"))
+        parts = []
+        if first_month is not None:
+            rows = fetch_rollup(conn, first_month, last_month, self._rollup_types(filters))
+            parts.extend((type, total, count) for _, type, total, count, _, _ in rows)
+        for range_start, range_end in ranges:
+            summary = summarize_transactions(conn, **dict(filters, start_date=range_start, end_date=range_end))
+            parts.extend((type, total, count) for type, (total, count) in summary.items())
+        totals = {}
+        for type, total, count in parts:
+            if count:
+                previous_total, previous_count = totals.get(type, (Money(0), 0))
+                totals[type] = (previous_total + total, previous_count + count)
+        return totals
+
+    @timed()
+    def summarize_by_category(self, **filters):
+        """Calcula soma e quantidade por categoria e tipo, agrupadas pelo SQLite.
+
+        Nenhuma transação é lida para o Python: só as somas de cada grupo
+        saem do banco (ver ``database.create_dimension_indexes``).
+
+        Args:
+            **filters: Os mesmos filtros aceitos por ``query_transactions``;
+                start_date e end_date delimitam o período.
+
+        Returns:
+            list: Tuplas (id, nome, tipo, soma, quantidade), como as de
+                ``database.summarize_by_dimension``.
+        """
+        return summarize_by_dimension(self.db.reader(), "category", **filters)
+
+    @timed()
+    def summarize_by_account(self, **filters):
+        """Calcula soma e quantidade por conta e tipo, agrupadas pelo SQLite.
+
+        Args:
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
+        Returns:
+            list: Tuplas (id, nome, tipo, soma, quantidade), como as de
+                ``database.summarize_by_dimension``.
+        """
+        return summarize_by_dimension(self.db.reader(), "account", **filters)
+
+    @timed()
+    def get_categories(self):
+        """Recupera as categorias cadastradas.
+
+        Returns:
+            list: Tuplas (id, nome) em ordem de nome.
+        """
+        return fetch_dimension(self.db.reader(), "category")
+
+    @timed()
+    def get_accounts(self):
+        """Recupera as contas cadastradas.
+
+        Returns:
+            list: Tuplas (id, nome) em ordem de nome.
+        """
+        return fetch_dimension(self.db.reader(), "account")
+
+    @timed()
+    def add_category(self, name):
+        """Cadastra uma categoria, ou encontra a já cadastrada com o mesmo nome.
+
+        Args:
+            name (str): Nome da categoria.
+
+        Returns:
+            int: ID da categoria, ou None se o nome for inválido.
         """
-        return fetch_transactions(self.conn)
+        return self._add_dimension("category", name)
 
+    @timed()
+    def add_account(self, name):
+        """Cadastra uma conta, ou encontra a já cadastrada com o mesmo nome.
+
+        Args:
+            name (str): Nome da conta.
+
+        Returns:
+            int: ID da conta, ou None se o nome for inválido.
+        """
+        return self._add_dimension("account", name)
+
+    @timed()
+    def delete_category(self, category_id):
+        """Remove uma categoria; suas transações ficam sem categoria.
+
+        Args:
+            category_id (int): ID da categoria.
+
+        Returns:
+            bool: True se a categoria existia e foi removida.
+        """
+        return self._delete_dimension("category", category_id)
+
+    @timed()
+    def delete_account(self, account_id):
+        """Remove uma conta; suas transações ficam sem conta.
+
+        Args:
+            account_id (int): ID da conta.
+
+        Returns:
+            bool: True se a conta existia e foi removida.
+        """
+        return self._delete_dimension("account", account_id)
+
+    @timed()
+    def add_recurring_rule(self, description, amount, type, frequency, start_date, interval=1, end_date=None,
+                           category_id=None, account_id=None):
+        """Cadastra uma transação recorrente (aluguel, salário, assinatura).
+
+        As transações só são geradas por ``run_recurring_rules``, inclusive
+        as de datas já passadas.
+
+        Args:
+            description (str): Descrição das transações geradas.
+            amount (Money | float | str): Valor de cada transação, em reais.
+            type (str): Tipo das transações (Receita/Despesa).
+            frequency (str): "daily", "weekly", "monthly" ou "yearly".
+            start_date (str): Data da primeira ocorrência (DD/MM/AAAA ou AAAA-MM-DD).
+            interval (int): Quantidade de períodos entre as ocorrências.
+            end_date (str, optional): Data após a qual não há ocorrências.
+            category_id (int, optional): ID da categoria.
+            account_id (int, optional): ID da conta.
+
+        Returns:
+            int: ID da regra, ou None se algum campo for inválido.
+        """
+        try:
+            rule = RecurringRule.create(description, amount, type, frequency, start_date, interval, end_date,
+                                        category_id, account_id)
+        except ValueError as e:
+            print(f"Erro ao cadastrar transação recorrente: {e}")
+            return None
+        with self.db.transaction() as conn:
+            return insert_recurring_rule(conn, rule)
+
+    @timed()
+    def get_recurring_rules(self):
+        """Recupera as transações recorrentes cadastradas.
+
+        Returns:
+            list: Lista de ``RecurringRule`` em ordem de id.
+        """
+        return fetch_recurring_rules(self.db.reader())
+
+    @timed()
+    def delete_recurring_rule(self, rule_id):
+        """Remove uma transação recorrente; as transações já geradas ficam.
+
+        Args:
+            rule_id (int): ID da regra.
+
+        Returns:
+            bool: True se a regra existia e foi removida.
+        """
+        with self.db.transaction() as conn:
+            return delete_recurring_rule(conn, rule_id)
+
+    @timed()
+    def run_recurring_rules(self, until=None):
+        """Gera as transações recorrentes devidas até uma data.
+
+        Todas as ocorrências devidas, de todas as regras, são gravadas em
+        uma única transação do banco, inclusive as acumuladas em longos
+        períodos sem execução. Cada ocorrência é gerada uma única vez:
+        chamar de novo (ou em outro processo) não duplica transações, e uma
+        transação gerada que for removida não volta a ser gerada.
+
+        Args:
+            until (str, optional): Data limite, inclusiva (DD/MM/AAAA ou
+                AAAA-MM-DD); por padrão, hoje.
+
+        Returns:
+            int: Quantidade de transações geradas, ou None em caso de erro.
+        """
+        until = normalize_date(until) if until is not None else date.today().isoformat()
+        with self.batch() as conn:
+            rules = fetch_recurring_rules(conn, due_until=until)
+            if not rules:
+                return 0
+            occurrences = []
+            next_dates = []
+            for rule in rules:
+                dates, next_date = rule.due_dates(until)
+                values = (rule.description, rule.amount, rule.type, rule.category_id, rule.account_id)
+                occurrences.extend((rule.id, (day, *values)) for day in dates)
+                next_dates.append((rule.id, next_date))
+            created = materialize_occurrences(conn, occurrences, next_dates)
+            if created is None:
+                return None
+            invalidate_rollup(conn, [(transaction.date, transaction.type) for transaction in created])
+            for transaction in created:
+                self._notify("add", None, transaction)
+        return len(created)
+
+    def _add_dimension(self, dimension, name):
+        name = name.strip() if isinstance(name, str) else ""
+        if not name:
+            print("Erro ao cadastrar categoria ou conta: o nome não pode ser vazio.")
+            return None
+        with self.db.transaction() as conn:
+            return insert_dimension(conn, dimension, name)
+
+    def _delete_dimension(self, dimension, dimension_id):
+        with self.batch() as conn:
+            removed = delete_dimension(conn, dimension, dimension_id)
+            if removed:
+                # As transações que a usavam mudaram (ficaram sem ela)
+                self._notify("reload")
+        return removed
+
+    @timed()
+    def get_monthly_rollup(self, first_month=None, last_month=None):
+        """Recupera os agregados mensais dos meses fechados.
+
+        Os meses ausentes ou invalidados por gravações são recalculados e
+        gravados antes da leitura.
+
+        Args:
+            first_month (str, optional): Primeiro mês (AAAA-MM); por padrão,
+                o da primeira transação.
+            last_month (str, optional): Último mês (AAAA-MM), inclusive; por
+                padrão, o mês anterior ao atual.
+
+        Returns:
+            list: Tuplas (mês, tipo, soma, quantidade, mínimo, máximo).
+        """
+        conn = self.db.reader()
+        closed = _previous_month(date.today().isoformat()[:7])
+        first_date, _ = fetch_date_range(conn)
+        first_month = first_month or (first_date[:7] if first_date else None)
+        last_month = min(last_month or closed, closed)
+        if first_month is None or first_month > last_month:
+            return []
+        self._store_rollup(first_month, last_month, TRANSACTION_TYPES)
+        return fetch_rollup(conn, first_month, last_month, TRANSACTION_TYPES)
+
+    @staticmethod
+    def _uses_rollup(filters):
+        """Indica se os filtros podem ser respondidos pelos agregados mensais."""
+        used = {name for name, value in filters.items() if value not in (None, "")}
+        return used <= _ROLLUP_FILTERS
+
+    @staticmethod
+    def _rollup_types(filters):
+        """Tipos de transação abrangidos pelos filtros."""
+        return [filters["type"]] if filters.get("type") else list(TRANSACTION_TYPES)
+
+    def _rollup_plan(self, conn, start_date=None, end_date=None):
+        """Divide um intervalo de datas entre agregados mensais e transações.
+
+        Returns:
+            tuple: (primeiro mês, último mês) fechados e completos no
+                intervalo, ou (None, None) se não houver, e a lista de
+                intervalos (início, fim) que devem ser lidos das transações.
+        """
+        first_date, last_date = fetch_date_range(conn)
+        if first_date is None:
+            return None, None, []
+        if start_date is None or start_date <= first_date:
+            first_month = first_date[:7]
+        else:
+            first_month = start_date[:7] if start_date[8:] == "01" else _next_month(start_date[:7])
+        if end_date is None or end_date >= last_date:
+            last_month = last_date[:7]
+        elif end_date == _day_before(f"{_next_month(end_date[:7])}-01"):
+            last_month = end_date[:7]
+        else:
+            last_month = _previous_month(end_date[:7])
+        # O mês corrente (e os futuros) ainda recebem lançamentos
+        last_month = min(last_month, _previous_month(date.today().isoformat()[:7]))
+        # Intervalos sempre fechados e limitados às datas existentes: com um
+        # limite aberto o SQLite tende a preferir o índice de tipo e
+        # percorrer a tabela inteira
+        low = max(start_date or first_date, first_date)
+        high = min(end_date or last_date, last_date)
+        if first_month > last_month:
+            return None, None, [(low, high)] if low <= high else []
+        ranges = []
+        if low < f"{first_month}-01":
+            ranges.append((low, _day_before(f"{first_month}-01")))
+        after = f"{_next_month(last_month)}-01"
+        if high >= after:
+            ranges.append((after, high))
+        return first_month, last_month, ranges
+
+    def _refresh_rollup(self, start_date, end_date, types):
+        """Grava os agregados mensais ausentes do intervalo, se houver."""
+        first_month, last_month, _ = self._rollup_plan(self.db.reader(), start_date, end_date)
+        if first_month is not None:
+            self._store_rollup(first_month, last_month, types)
+
+    def _store_rollup(self, first_month, last_month, types):
+        """Calcula os agregados mensais ausentes e os grava, se possível.
+
+        O cálculo percorre as transações na conexão de leitura, sem reter o
+        lock de escrita, então não atrasa as gravações da interface. A
+        gravação é pulada se outra thread estiver gravando ou se algo tiver
+        sido gravado desde a leitura: os agregados são só um cache, e
+        ``fetch_rollup`` calcula na hora os que faltarem.
+        """
+        reader = self.db.reader()
+        if self.db.shared:
+            # Banco em memória: leitura e escrita na mesma conexão
+            with self.db.transaction() as writer:
+                refresh_rollup(writer, first_month, last_month, types)
+            return
+        if reader.in_transaction:
+            # Uma leitura mais antiga que a versão abaixo poderia gravar dados velhos
+            return
+        version = data_version(reader)
+        with snapshot(reader):
+            rows = compute_rollup(reader, first_month, last_month, types)
+        if rows:
+            with self.db.try_transaction() as writer:
+                if writer is not None and data_version(reader) == version:
+                    store_rollup(writer, rows)
+
+    @timed()
     def update_transaction(self, transaction_id, date, description, amount, type):
         """Atualiza uma transação existente.
 
+        A categoria e a conta são mantidas; para alterá-las, use
+        ``update_transactions``.
+
         Args:
             transaction_id (int): ID da transação a ser atualizada.
-            date (str): Nova data da transação.
+            date (str): Nova data da transação (DD/MM/AAAA ou AAAA-MM-DD).
             description (str): Nova descrição da transação.
-            amount (float): Novo valor da transação.
+            amount (Money | float | str): Novo valor da transação, em reais.
             type (str): Novo tipo da transação (Receita/Despesa).
+
+        Returns:
+            Transaction: A transação atualizada, ou None se não foi possível atualizá-la.
         """
         try:
-            amount = float(amount)
-            if amount < 0:
-                raise ValueError("O valor da transação não pode ser negativo.")
-            update_transaction(self.conn, transaction_id, date, description, amount, type)
+            date, description, amount, type, _, _ = Transaction.validate(date, description, amount, type)
         except ValueError as e:
             print(f"Erro ao atualizar transação: {e}")
+            return None
+        with self.batch() as conn:
+            old = fetch_transaction(conn, transaction_id)
+            if old is None or not update_transaction(conn, transaction_id, date, description, amount, type):
+                return None
+            new = old._replace(date=date, description=description, amount=amount, type=type)
+            # A alteração pode mover a transação para outro mês ou tipo
+            invalidate_rollup(conn, [(old.date, old.type), (new.date, new.type)])
+            self._notify("update", old, new)
+        return new
 
+    @timed()
     def delete_transaction(self, transaction_id):
         """Remove uma transação.
 
         Args:
             transaction_id (int): ID da transação a ser removida.
+
+        Returns:
+            Transaction: A transação removida, ou None se ela não existia.
+        """
+        with self.batch() as conn:
+            old = fetch_transaction(conn, transaction_id)
+            if old is None or not delete_transaction(conn, transaction_id):
+                return None
+            invalidate_rollup(conn, [(old.date, old.type)])
+            self._notify("delete", old, None)
+        return old
+
+    @timed()
+    def delete_transactions(self, transaction_ids):
+        """Remove várias transações em uma única transação do banco.
+
+        Args:
+            transaction_ids (iterable): IDs das transações a serem removidas.
+
+        Returns:
+            int: Quantidade de transações removidas (0 em caso de erro).
         """
-        delete_transaction(self.conn, transaction_id)
+        transaction_ids = [int(transaction_id) for transaction_id in transaction_ids]
+        with self.batch() as conn:
+            old_rows = fetch_transactions_by_ids(conn, transaction_ids)
+            count = delete_transactions(conn, transaction_ids)
+            if not count:
+                return 0
+            invalidate_rollup(conn, [(old.date, old.type) for old in old_rows])
+            for old in old_rows:
+                self._notify("delete", old, None)
+        return count
+
+    @timed()
+    def update_transactions(self, transaction_ids, **changes):
+        """Aplica as mesmas alterações a várias transações de uma vez.
+
+        Args:
+            transaction_ids (iterable): IDs das transações a serem atualizadas.
+            **changes: Novos valores para date, description, amount, type,
+                category_id e/ou account_id (None remove a categoria ou conta).
+
+        Returns:
+            int: Quantidade de transações atualizadas, ou None se as
+                alterações forem inválidas ou a gravação falhar.
+        """
+        try:
+            if "date" in changes:
+                changes["date"] = normalize_date(changes["date"])
+            if "amount" in changes:
+                changes["amount"] = validate_amount(changes["amount"])
+            if "type" in changes:
+                changes["type"] = validate_type(changes["type"])
+            if "category_id" in changes:
+                changes["category_id"] = validate_reference(changes["category_id"], "Categoria")
+            if "account_id" in changes:
+                changes["account_id"] = validate_reference(changes["account_id"], "Conta")
+        except ValueError as e:
+            print(f"Erro ao atualizar transações: {e}")
+            return None
+        transaction_ids = [int(transaction_id) for transaction_id in transaction_ids]
+        with self.batch() as conn:
+            old_rows = fetch_transactions_by_ids(conn, transaction_ids)
+            count = update_transactions(conn, transaction_ids, changes)
+            if count is None:
+                return None
+            new_rows = [old._replace(**changes) for old in old_rows]
+            invalidate_rollup(conn, [(row.date, row.type) for row in old_rows + new_rows])
+            for old, new in zip(old_rows, new_rows):
+                self._notify("update", old, new)
+        return count
+
+    def iter_transactions(self, chunk_size=DATAFRAME_CHUNK_SIZE, **filters):
+        """Percorre as transações filtradas em ordem de id, sem carregá-las todas.
+
+        Args:
+            chunk_size (int): Linhas lidas do banco por bloco.
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
+        Yields:
+            Transaction: Cada transação.
+        """
+        conn = self.db.reader()
+        with snapshot(conn):
+            for rows in iter_transaction_chunks(conn, TRANSACTION_COLUMNS, chunk_size, **filters):
+                for row in rows:
+                    yield transaction_row(None, row)
+
+    @timed()
+    def iter_transaction_arrays(self, columns=None, chunk_size=DATAFRAME_CHUNK_SIZE, **filters):
+        """Percorre as transações em blocos de arrays NumPy, um por coluna.
+
+        Todos os blocos são lidos de uma mesma transação de leitura. As
+        colunas saem tipadas: id int64, date datetime64[D], amount int64 (em
+        centavos), description como objeto, type como código int8 (posição
+        em ``TRANSACTION_TYPES``) e category_id e account_id int64, com 0
+        para transações sem categoria ou conta.
 
-    def get_transactions_dataframe(self):
+        Args:
+            columns (list, optional): Colunas desejadas (subconjunto de
+                ``database.TRANSACTION_COLUMNS``); por padrão, todas menos
+                category_id e account_id.
+            chunk_size (int): Linhas lidas do banco por bloco.
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
+        Yields:
+            dict: Mapeamento coluna -> array do bloco, em ordem de id.
+        """
+        import numpy as np
+
+        columns = list(columns or _DEFAULT_COLUMNS)
+        row_dtype = np.dtype([(column, "O" if column in _NULLABLE_COLUMNS else _COLUMN_DTYPES[column])
+                              for column in columns])
+        conn = self.db.reader()
+        with snapshot(conn):
+            for rows in iter_transaction_chunks(conn, columns, chunk_size, **filters):
+                chunk = np.fromiter(rows, dtype=row_dtype, count=len(rows))
+                del rows
+                arrays = {}
+                for column in columns:
+                    values = chunk[column]
+                    if column == "type":
+                        codes = np.full(len(values), -1, dtype=np.int8)
+                        for code, type in enumerate(TRANSACTION_TYPES):
+                            codes[values == type] = code
+                        values = codes
+                    elif column in _NULLABLE_COLUMNS:
+                        values = np.array([value or 0 for value in values], dtype=np.int64)
+                    arrays[column] = values
+                yield arrays
+
+    @timed()
+    def get_transactions_dataframe(self, columns=None, chunk_size=DATAFRAME_CHUNK_SIZE, **filters):
         """Retorna as transações como um DataFrame do Pandas.
 
+        As linhas são lidas em blocos de ``chunk_size`` e copiadas direto para
+        arrays pré-alocados de cada coluna, sem montar a lista completa de
+        tuplas. As colunas saem tipadas: id int64, date datetime64, amount
+        int64 em centavos (somas exatas; divida por 100 para reais), type
+        categórico e description como objeto.
+
+        Args:
+            columns (list, optional): Colunas desejadas (subconjunto de
+                ``database.TRANSACTION_COLUMNS``); por padrão, todas menos
+                category_id e account_id (0 quando ausentes, se pedidas).
+            chunk_size (int): Linhas lidas do banco por bloco.
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
         Returns:
             pd.DataFrame: DataFrame contendo as transações.
         """
-        transactions = self.get_transactions()
-        df = pd.DataFrame(transactions, columns=["id", "date", "description", "amount", "type"])
-        return df
+        import numpy as np
+        import pandas as pd
+
+        columns = list(columns or _DEFAULT_COLUMNS)
+        conn = self.db.reader()
+        with snapshot(conn):
+            total = count_transactions(conn, **filters)
+            arrays = {column: np.empty(total, dtype=np.int8 if column == "type" else _COLUMN_DTYPES[column])
+                      for column in columns}
+            offset = 0
+            for chunk in self.iter_transaction_arrays(columns, chunk_size, **filters):
+                size = len(chunk[columns[0]])
+                for column, values in chunk.items():
+                    arrays[column][offset:offset + size] = values
+                offset += size
+        data = {}
+        for column, array in arrays.items():
+            if column == "date":
+                array = array.astype("datetime64[ns]")
+            elif column == "type":
+                array = pd.Categorical.from_codes(array, categories=TRANSACTION_TYPES)
+            data[column] = array
+        return pd.DataFrame(data, columns=columns)
+
+    @timed()
+    def generate_report(self, period="month", chunk_size=DATAFRAME_CHUNK_SIZE, **filters):
+        """Calcula o fluxo líquido e o saldo acumulado por período.
+
+        Quando ``start_date`` é informado, o saldo acumulado parte do saldo
+        das transações anteriores a essa data (com os demais filtros). Nos
+        relatórios por mês ou ano filtrados só por data e tipo, os meses
+        fechados vêm dos agregados mensais.
+
+        Args:
+            period (str): Um dos valores de ``reports.PERIODS``.
+            chunk_size (int): Linhas lidas do banco por bloco.
+            **filters: Os mesmos filtros aceitos por ``query_transactions``.
+
+        Returns:
+            pd.DataFrame: Relatório descrito em ``reports.compute_report``.
+        """
+        import numpy as np
+        from reports import compute_report
 
+        start_date = filters.get("start_date")
+        use_rollup = period in ("month", "year") and self._uses_rollup(filters)
+        if self._uses_rollup(filters):
+            # Cobre também o saldo anterior a start_date
+            self._refresh_rollup(None, filters.get("end_date"), self._rollup_types(filters))
+        columns = ["date", "amount", "type"]
+        opening_balance = Money(0)
+        monthly = None
+        conn = self.db.reader()
+        with snapshot(conn):
+            if start_date is not None:
+                previous = dict(filters, start_date=None, end_date=_day_before(start_date))
+                if self._uses_rollup(previous):
+                    summary = self._summarize_with_rollup(conn, previous)
+                else:
+                    summary = summarize_transactions(conn, **previous)
+                opening_balance = summary.get("Receita", (Money(0), 0))[0] - summary.get("Despesa", (Money(0), 0))[0]
+            if use_rollup:
+                first_month, last_month, ranges = self._rollup_plan(conn, start_date, filters.get("end_date"))
+                if first_month is not None:
+                    rows = fetch_rollup(conn, first_month, last_month, self._rollup_types(filters))
+                    monthly = {
+                        "month": np.array([row[0] for row in rows], dtype="datetime64[M]"),
+                        "Receita": np.array([row[2] if row[1] == "Receita" else 0 for row in rows], dtype=np.int64),
+                        "Despesa": np.array([row[2] if row[1] == "Despesa" else 0 for row in rows], dtype=np.int64),
+                        "count": np.array([row[3] for row in rows], dtype=np.int64),
+                    }
+                chunks = itertools.chain.from_iterable(
+                    self.iter_transaction_arrays(columns, chunk_size,
+                                                 **dict(filters, start_date=range_start, end_date=range_end))
+                    for range_start, range_end in ranges)
+            else:
+                chunks = self.iter_transaction_arrays(columns, chunk_size, **filters)
+            return compute_report(chunks, period, opening_balance, monthly)
+
+    @timed()
     def get_balance(self):
-        """Calcula o saldo total.
+        """Calcula o saldo total a partir dos totais acumulados.
 
         Returns:
-            float: Saldo total.
+            Money: Saldo total.
         """
-        df = self.get_transactions_dataframe()
-        if not df.empty:
-            receitas = df[df['type'] == 'Receita']['amount'].sum()
-            despesas = df[df['type'] == 'Despesa']['amount'].sum()
-            return receitas - despesas
-        return 0.0
+        totals = fetch_totals(self.db.reader())
+        return totals.get('Receita', Money(0)) - totals.get('Despesa', Money(0))
 
+    @timed()
     def get_total_income(self):
-        """Calcula o total de receitas.
+        """Calcula o total de receitas a partir dos totais acumulados.
 
         Returns:
-            float: Total de receitas.
+            Money: Total de receitas.
         """
-        df = self.get_transactions_dataframe()
-        if not df.empty:
-            return df[df['type'] == 'Receita']['amount'].sum()
-        return 0.0
+        return fetch_totals(self.db.reader()).get('Receita', Money(0))
 
+    @timed()
     def get_total_expenses(self):
-        """Calcula o total de despesas.
+        """Calcula o total de despesas a partir dos totais acumulados.
+
+        Returns:
+            Money: Total de despesas.
+        """
+        return fetch_totals(self.db.reader()).get('Despesa', Money(0))
+
+    @timed()
+    def get_daily_balance(self):
+        """Calcula o saldo acumulado ao fim de cada dia, como o relatório diário.
+
+        Usa os totais diários mantidos pelos gatilhos, sem ler as
+        transações: o custo depende da quantidade de dias. A série cobre
+        todos os dias da primeira à última transação; nos dias sem
+        movimento o saldo se repete.
+
+        Returns:
+            tuple: (datas como ``datetime64[D]``, saldos em centavos como
+                ``int64``).
+        """
+        import numpy as np
+
+        rows = fetch_daily_net(self.db.reader())
+        days = np.array([day for day, _ in rows], dtype="datetime64[D]")
+        if not len(days):
+            return days, np.zeros(0, dtype=np.int64)
+        dates = np.arange(days[0], days[-1] + 1)
+        net = np.zeros(len(dates), dtype=np.int64)
+        net[(days - days[0]).astype(np.int64)] = [amount for _, amount in rows]
+        return dates, np.cumsum(net)
+
+    @timed()
+    def rebuild_totals(self):
+        """Reconstrói os totais acumulados a partir das transações.
+
+        Returns:
+            bool: True se a reconstrução foi concluída.
+        """
+        with self.db.transaction() as conn:
+            return rebuild_totals(conn)
+
+    @timed()
+    def verify_totals(self):
+        """Verifica se os totais acumulados correspondem às transações.
 
         Returns:
-            float: Total de despesas.
+            list: Divergências encontradas; vazia se estiver tudo consistente.
         """
-        df = self.get_transactions_dataframe()
-        if not df.empty:
-            return df[df['type'] == 'Despesa']['amount'].sum()
-        return 0.0
\ No newline at end of file
+        return verify_totals(self.db.reader())
@@ -0,0 +1,169 @@
+import csv
+import os
+
+from models import TRANSACTION_TYPES, Money
+
+EXPORT_COLUMNS = ("id", "date", "description", "amount", "type", "category", "account")
+"""Colunas gravadas nas exportações, na ordem do arquivo.
+
+Categoria e conta são gravadas pelo nome, que continua valendo em outro
+banco; a importação cadastra os nomes que ainda não existirem.
+"""
+
+SOURCE_COLUMNS = ("id", "date", "description", "amount", "type", "category_id", "account_id")
+"""Colunas de ``transactions`` lidas para as exportações, na ordem de ``EXPORT_COLUMNS``."""
+
+# Formato de cada extensão aceita por export_format
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+def export_format(path):
+    """Escolhe o formato de exportação pela extensão do arquivo.
+
+    Args:
+        path (str): Caminho do arquivo (.csv, .parquet, .arrow ou .feather).
+
+    Returns:
+        str: "csv", "parquet" ou "arrow" (Arrow IPC).
+
+    Raises:
+        ValueError: Se a extensão não for suportada.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Formato de arquivo não suportado: {extension or path}.")
+    return _EXTENSIONS[extension]
+
+def write_csv(path, chunks, categories=None, accounts=None, delimiter=",", encoding="utf-8"):
+    """Grava blocos de transações em um CSV, um bloco por vez.
+
+    O arquivo tem cabeçalho com ``EXPORT_COLUMNS``, valores em reais com
+    duas casas e pode ser importado de volta por ``importers.read_csv``.
+
+    Args:
+        path (str): Caminho do arquivo CSV.
+        chunks (iterable): Listas de tuplas com as ``SOURCE_COLUMNS``, com o
+            valor em centavos, como as de ``database.iter_transaction_chunks``.
+        categories (dict, optional): Nome de cada categoria, pelo id.
+        accounts (dict, optional): Nome de cada conta, pelo id.
+        delimiter (str): Separador de colunas.
+        encoding (str): Codificação do arquivo.
+
+    Returns:
+        tuple: (quantidade gravada, maior id gravado ou None).
+    """
+    categories = categories or {}
+    accounts = accounts or {}
+    count = 0
+    last_id = None
+    with open(path, "w", newline="", encoding=encoding) as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in chunks:
+            writer.writerows((id, date, description, Money(amount), type,
+                              categories.get(category_id), accounts.get(account_id))
+                             for id, date, description, amount, type, category_id, account_id in rows)
+            count += len(rows)
+            last_id = max(last_id or 0, rows[-1][0])
+    return count, last_id
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ("id", pa.int64()),
+        ("date", pa.date32()),
+        ("description", pa.string()),
+        ("amount", pa.decimal128(18, 2)),
+        ("type", pa.dictionary(pa.int8(), pa.string())),
+        ("category", pa.dictionary(pa.int32(), pa.string())),
+        ("account", pa.dictionary(pa.int32(), pa.string())),
+    ])
+
+def _decimal_array(pa, np, cents):
+    """Monta um array decimal128(18, 2) a partir de centavos em int64.
+
+    O decimal128 guarda o inteiro sem escala em 16 bytes (complemento de
+    dois, little-endian), então os centavos são copiados sem conversão.
+    """
+    words = np.empty((len(cents), 2), dtype=np.int64)
+    words[:, 0] = cents
+    words[:, 1] = cents >> 63
+    return pa.Array.from_buffers(pa.decimal128(18, 2), len(cents), [None, pa.py_buffer(words)])
+
+def _name_lookup(pa, np, names):
+    """Prepara a troca de ids por nomes em ``_name_array``.
+
+    Returns:
+        tuple: (array com os nomes, posição de cada id nesse array, -1 para
+            ids sem nome, como o 0 das transações sem categoria ou conta).
+    """
+    ids = np.fromiter(names, dtype=np.int64, count=len(names))
+    positions = np.full(int(ids.max(initial=0)) + 1, -1, dtype=np.int32)
+    positions[ids] = np.arange(len(ids), dtype=np.int32)
+    return pa.array(list(names.values()), type=pa.string()), positions
+
+def _name_array(pa, ids, dictionary, positions):
+    """Monta o array de dicionário com os nomes de ``ids``; ids sem nome viram nulos."""
+    indices = positions[ids]
+    return pa.DictionaryArray.from_arrays(pa.array(indices, mask=indices < 0), dictionary)
+
+def write_columnar(path, chunks, format="parquet", categories=None, accounts=None):
+    """Grava blocos de transações em Parquet ou Arrow IPC.
+
+    Cada bloco vira um row group (Parquet) ou record batch (Arrow), de modo
+    que a memória usada depende só do tamanho do bloco. Requer o pacote
+    opcional ``pyarrow``, importado apenas aqui. O valor é gravado como
+    decimal de duas casas, exato; categoria e conta, como colunas de
+    dicionário com os nomes.
+
+    Args:
+        path (str): Caminho do arquivo.
+        chunks (iterable): Blocos de arrays por coluna, como os de
+            ``FinancialController.iter_transaction_arrays`` com as
+            ``SOURCE_COLUMNS``.
+        format (str): "parquet" ou "arrow".
+        categories (dict, optional): Nome de cada categoria, pelo id.
+        accounts (dict, optional): Nome de cada conta, pelo id.
+
+    Returns:
+        tuple: (quantidade gravada, maior id gravado ou None).
+
+    Raises:
+        ImportError: Se o ``pyarrow`` não estiver instalado.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("A exportação em Parquet/Arrow requer o pacote pyarrow.") from e
+    import numpy as np
+    schema = _arrow_schema(pa)
+    types = pa.array(TRANSACTION_TYPES, type=pa.string())
+    category_names = _name_lookup(pa, np, categories or {})
+    account_names = _name_lookup(pa, np, accounts or {})
+    if format == "parquet":
+        writer = pq.ParquetWriter(path, schema)
+    elif format == "arrow":
+        writer = pa.ipc.new_file(path, schema)
+    else:
+        raise ValueError(f"Formato colunar inválido: {format}.")
+    count = 0
+    last_id = None
+    with writer:
+        for chunk in chunks:
+            batch = pa.record_batch([
+                pa.array(chunk["id"], type=pa.int64()),
+                pa.array(chunk["date"], type=pa.date32()),
+                pa.array(chunk["description"], type=pa.string()),
+                _decimal_array(pa, np, chunk["amount"]),
+                pa.DictionaryArray.from_arrays(chunk["type"], types),
+                _name_array(pa, chunk["category_id"], *category_names),
+                _name_array(pa, chunk["account_id"], *account_names),
+            ], schema=schema)
+            writer.write_batch(batch)
+            count += len(chunk["id"])
+            last_id = max(last_id or 0, int(chunk["id"][-1]))
+    return count, last_id
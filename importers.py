@@ -0,0 +1,204 @@
+import csv
+import os
+import re
+from decimal import Decimal, InvalidOperation
+
+# Nomes aceitos no cabeçalho do CSV para cada campo da transação
+CSV_COLUMNS = {
+    "date": ("date", "data"),
+    "description": ("description", "descrição", "descricao", "histórico", "historico", "memo"),
+    "amount": ("amount", "valor"),
+    "type": ("type", "tipo"),
+    "category": ("category", "categoria"),
+    "account": ("account", "conta"),
+}
+
+_OFX_BLOCK = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.DOTALL)
+_OFX_TAG = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+def parse_amount(text):
+    """Converte um valor textual (1234.56, 1.234,56, -R$ 10,00) para Decimal.
+
+    Args:
+        text (str): Valor como aparece no extrato.
+
+    Returns:
+        Decimal: Valor com sinal, exato como no texto.
+
+    Raises:
+        ValueError: Se o texto não representar um número.
+    """
+    text = text.strip().replace("R$", "").replace(" ", "")
+    if "," in text:
+        text = text.replace(".", "").replace(",", ".")
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Valor inválido: {text!r}.") from None
+    if not amount.is_finite():
+        raise ValueError(f"Valor inválido: {text!r}.")
+    return amount
+
+def _signed_row(date, description, amount):
+    """Deduz o tipo pelo sinal do valor, como nos extratos bancários."""
+    amount = parse_amount(amount)
+    if amount < 0:
+        return date, description, -amount, "Despesa"
+    return date, description, amount, "Receita"
+
+def read_csv(path, delimiter=None, encoding="utf-8-sig"):
+    """Lê um CSV de transações linha a linha.
+
+    O cabeçalho deve conter data, descrição e valor (ver ``CSV_COLUMNS``).
+    Sem a coluna de tipo, valores negativos são despesas e positivos,
+    receitas. Categoria e conta, se houver, vêm pelo nome, como as grava
+    ``exporters.write_csv``.
+
+    Args:
+        path (str): Caminho do arquivo CSV.
+        delimiter (str, optional): Separador; detectado no cabeçalho se omitido.
+        encoding (str): Codificação do arquivo.
+
+    Yields:
+        tuple: (date, description, amount, type), seguidos dos nomes da
+            categoria e da conta (texto vazio se não houver) quando o
+            cabeçalho tem essas colunas. Linhas que não puderem ser
+            interpretadas são repassadas como estão, para que a validação da
+            importação as rejeite com a posição correta.
+    """
+    with open(path, newline="", encoding=encoding) as f:
+        header = f.readline()
+        if delimiter is None:
+            delimiter = ";" if header.count(";") > header.count(",") else ","
+        names = [name.strip().lower() for name in next(csv.reader([header], delimiter=delimiter))]
+        index = {}
+        for field, aliases in CSV_COLUMNS.items():
+            for alias in aliases:
+                if alias in names:
+                    index[field] = names.index(alias)
+                    break
+        missing = {"date", "description", "amount"} - index.keys()
+        if missing:
+            raise ValueError(f"Colunas ausentes no CSV: {', '.join(sorted(missing))}.")
+        date_col, description_col, amount_col = index["date"], index["description"], index["amount"]
+        type_col = index.get("type")
+        name_cols = [index.get("category"), index.get("account")]
+        if name_cols == [None, None]:
+            name_cols = []
+        for row in csv.reader(f, delimiter=delimiter):
+            if not row:
+                continue
+            try:
+                if type_col is None:
+                    values = _signed_row(row[date_col], row[description_col], row[amount_col])
+                else:
+                    values = row[date_col], row[description_col], parse_amount(row[amount_col]), row[type_col].strip()
+                if name_cols:
+                    values += tuple("" if col is None else row[col] for col in name_cols)
+                yield values
+            except (IndexError, ValueError):
+                yield tuple(row)
+
+def read_ofx(path, encoding="latin-1", chunk_size=1 << 16):
+    """Lê os lançamentos (<STMTTRN>) de um extrato OFX em blocos.
+
+    Funciona tanto com OFX em SGML (tags sem fechamento) quanto em XML. O
+    arquivo é lido em pedaços de ``chunk_size`` bytes, sem carregá-lo inteiro.
+
+    Args:
+        path (str): Caminho do arquivo OFX.
+        encoding (str): Codificação do arquivo.
+        chunk_size (int): Tamanho de cada leitura.
+
+    Yields:
+        tuple: (date, description, amount, type).
+    """
+    buffer = ""
+    with open(path, encoding=encoding) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            buffer += chunk
+            end = 0
+            for match in _OFX_BLOCK.finditer(buffer):
+                tags = {name: value.strip() for name, value in _OFX_TAG.findall(match.group(1))}
+                posted = tags.get("DTPOSTED", "")
+                date = f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}"
+                description = tags.get("MEMO") or tags.get("NAME", "")
+                try:
+                    yield _signed_row(date, description, tags.get("TRNAMT", ""))
+                except ValueError:
+                    yield date, description, tags.get("TRNAMT"), tags.get("TRNTYPE")
+                end = match.end()
+            # Mantém apenas o lançamento incompleto (se houver) para a próxima leitura
+            start = buffer.find("<STMTTRN>", end)
+            buffer = buffer[start:] if start != -1 else buffer[-len("<STMTTRN>"):]
+            if not chunk:
+                break
+
+def read_columnar(path, batch_size=65536):
+    """Lê transações de um arquivo Parquet ou Arrow IPC em lotes.
+
+    Aceita os arquivos gravados por ``exporters.write_columnar``: precisa
+    das colunas date, description, amount e type (o id é ignorado);
+    category e account, com os nomes, são lidas se existirem. Requer o
+    pacote opcional ``pyarrow``, importado apenas aqui.
+
+    Args:
+        path (str): Caminho do arquivo (.parquet, .arrow ou .feather).
+        batch_size (int): Linhas lidas por lote do Parquet.
+
+    Yields:
+        tuple: (date, description, amount, type), seguidos dos nomes da
+            categoria e da conta (None se não houver) quando o arquivo tem
+            essas colunas.
+
+    Raises:
+        ImportError: Se o ``pyarrow`` não estiver instalado.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("A leitura de Parquet/Arrow requer o pacote pyarrow.") from e
+    columns = ["date", "description", "amount", "type"]
+    if os.path.splitext(path)[1].lower() == ".parquet":
+        parquet = pq.ParquetFile(path)
+        names = [name for name in ("category", "account") if name in parquet.schema_arrow.names]
+        batches = parquet.iter_batches(batch_size=batch_size, columns=columns + names)
+    else:
+        reader = pa.ipc.open_file(path)
+        names = [name for name in ("category", "account") if name in reader.schema.names]
+        batches = (reader.get_batch(i).select(columns + names) for i in range(reader.num_record_batches))
+    for batch in batches:
+        # Datas, tipos e nomes saem como texto, no formato esperado pela validação
+        values = [batch.column("date").cast(pa.string()).to_pylist(),
+                  batch.column("description").to_pylist(),
+                  batch.column("amount").to_pylist(),
+                  batch.column("type").cast(pa.string()).to_pylist()]
+        if names:
+            values += [batch.column(name).cast(pa.string()).to_pylist() if name in names
+                       else [None] * batch.num_rows for name in ("category", "account")]
+        yield from zip(*values)
+
+def read_file(path):
+    """Escolhe o leitor de extrato pela extensão do arquivo.
+
+    Args:
+        path (str): Caminho do arquivo (.csv, .ofx, .parquet, .arrow ou
+            .feather).
+
+    Returns:
+        iterator: Linhas (date, description, amount, type), seguidas dos
+            nomes da categoria e da conta quando o arquivo os tem.
+
+    Raises:
+        ValueError: Se a extensão não for suportada.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return read_csv(path)
+    if extension in (".ofx", ".qfx"):
+        return read_ofx(path)
+    if extension in (".parquet", ".arrow", ".feather"):
+        return read_columnar(path)
+    raise ValueError(f"Formato de arquivo não suportado: {extension or path}.")
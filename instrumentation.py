@@ -0,0 +1,326 @@
+"""Medição de tempo das camadas do aplicativo.
+
+Funções do banco, métodos do controlador e atualizações da interface são
+decoradas com ``timed``; com a medição desligada (o padrão), o decorador só
+testa uma variável global antes de chamar a função. ``enable()`` liga os
+cronômetros e contadores e, opcionalmente, o rastreamento das instruções
+SQL das conexões registradas com ``watch_connection``: instruções que
+demoram mais que o limite têm o plano (``EXPLAIN QUERY PLAN``) guardado.
+
+Os números acumulados são lidos com ``stats()``, formatados com
+``format_stats()`` e podem ser impressos periodicamente com ``start_log()``.
+"""
+import collections
+import contextlib
+import functools
+import inspect
+import sys
+import sqlite3
+import threading
+import time
+
+SLOW_STATEMENT_SECONDS = 0.1
+"""Duração a partir da qual uma instrução SQL tem o plano registrado."""
+
+SLOW_STATEMENT_LIMIT = 50
+"""Quantidade de instruções lentas mais recentes mantidas em ``stats()``."""
+
+# Instruções guardadas por chamada para medir a duração de cada uma; acima
+# disso (importações com executemany, por exemplo) elas só são contadas
+_STATEMENT_LIMIT = 10000
+
+# Instruções sem plano de consulta
+_NO_PLAN = ("BEGIN", "COMMIT", "END", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA", "EXPLAIN")
+
+_enabled = False
+_trace_sql = False
+_slow_seconds = SLOW_STATEMENT_SECONDS
+_lock = threading.Lock()
+_timers = {}
+_counters = collections.Counter()
+_slow = collections.deque(maxlen=SLOW_STATEMENT_LIMIT)
+_local = threading.local()
+_connections = {}
+_log_thread = None
+_log_stop = None
+
+def enable(trace_sql=True, slow_seconds=SLOW_STATEMENT_SECONDS):
+    """Liga a medição.
+
+    Args:
+        trace_sql (bool): Se True, rastreia as instruções SQL das conexões
+            registradas, contando-as e guardando o plano das lentas.
+        slow_seconds (float): Duração mínima de uma instrução lenta.
+    """
+    global _enabled, _trace_sql, _slow_seconds
+    _slow_seconds = slow_seconds
+    _trace_sql = trace_sql
+    _enabled = True
+    with _lock:
+        connections = list(_connections)
+    for conn in connections:
+        _set_trace(conn)
+
+def disable():
+    """Desliga a medição; os números acumulados são mantidos."""
+    global _enabled, _trace_sql
+    _enabled = False
+    _trace_sql = False
+    with _lock:
+        connections = list(_connections)
+    for conn in connections:
+        _set_trace(conn)
+
+def is_enabled():
+    """Indica se a medição está ligada."""
+    return _enabled
+
+def reset():
+    """Zera cronômetros, contadores e instruções lentas."""
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _slow.clear()
+
+def watch_connection(conn, lock=None):
+    """Registra uma conexão para o rastreamento de SQL.
+
+    Deve ser chamada para cada conexão aberta; ``unwatch_connection`` a
+    remove antes de fechá-la.
+
+    Args:
+        conn (sqlite3.Connection): Conexão com o banco de dados.
+        lock (optional): Lock que serializa o uso da conexão entre threads,
+            adquirido para obter o plano de uma instrução lenta.
+    """
+    with _lock:
+        _connections[conn] = lock
+    _set_trace(conn)
+
+def unwatch_connection(conn):
+    """Deixa de rastrear uma conexão registrada com ``watch_connection``."""
+    with _lock:
+        _connections.pop(conn, None)
+    try:
+        conn.set_trace_callback(None)
+    except sqlite3.Error:
+        pass
+
+def _set_trace(conn):
+    try:
+        conn.set_trace_callback(functools.partial(_on_statement, conn) if _trace_sql else None)
+    except sqlite3.Error:
+        pass
+
+def _on_statement(conn, sql):
+    """Recebe cada instrução executada por uma conexão rastreada."""
+    if not _enabled:
+        return
+    statements = getattr(_local, "statements", None)
+    if statements is not None:
+        last = statements[-1] if statements else None
+        # Gatilhos e cada linha de um executemany repetem a instrução
+        if last is not None and last[0] is conn and last[1] == sql:
+            return
+        if len(statements) < _STATEMENT_LIMIT:
+            statements.append((conn, sql, time.perf_counter()))
+    with _lock:
+        _counters["sqlite.statements"] += 1
+
+def count(name, amount=1):
+    """Soma ``amount`` ao contador ``name``, se a medição estiver ligada."""
+    if _enabled:
+        with _lock:
+            _counters[name] += amount
+
+def _record(name, seconds):
+    with _lock:
+        timer = _timers.get(name)
+        if timer is None:
+            _timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+def _begin():
+    """Começa a guardar as instruções da thread, se ninguém as guarda ainda."""
+    if getattr(_local, "statements", None) is None:
+        _local.statements = []
+        return True
+    return False
+
+def _finish(name, owner, finished):
+    """Marca o fim de uma chamada medida e, na mais externa, analisa as instruções."""
+    statements = _local.statements
+    if statements:
+        # O fim da chamada encerra a duração da última instrução dela
+        statements.append((None, None, finished))
+    if not owner:
+        return
+    _local.statements = None
+    for (conn, sql, started), (_, _, ended) in zip(statements, statements[1:]):
+        if conn is not None and ended - started >= _slow_seconds:
+            _record_slow(name, conn, sql, ended - started)
+
+def _record_slow(name, conn, sql, seconds):
+    plan = None
+    with _lock:
+        lock = _connections.get(conn, False)
+    if lock is not False and not sql.lstrip().upper().startswith(_NO_PLAN):
+        try:
+            with lock or contextlib.nullcontext():
+                rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+            plan = [row[3] for row in rows]
+        except sqlite3.Error:
+            pass
+    with _lock:
+        _counters["sqlite.slow_statements"] += 1
+        _slow.append({"call": name, "seconds": seconds, "sql": sql, "plan": plan})
+
+@contextlib.contextmanager
+def timer(name):
+    """Mede o tempo de um bloco sob o nome ``name``.
+
+    Exemplo::
+
+        with instrumentation.timer("views.desenhar_grafico"):
+            ...
+    """
+    if not _enabled:
+        yield
+        return
+    owner = _begin()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        finished = time.perf_counter()
+        _record(name, finished - started)
+        _finish(name, owner, finished)
+
+def timed(name=None):
+    """Decorador que mede cada chamada da função.
+
+    O nome padrão é ``módulo.qualname`` da função. Em funções geradoras,
+    conta-se o tempo gasto dentro do gerador até ele terminar, sem o do
+    código que consome os itens.
+
+    Args:
+        name (str, optional): Nome do cronômetro.
+    """
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return func(*args, **kwargs)
+                return _timed_generator(label, func(*args, **kwargs))
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            owner = _begin()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished = time.perf_counter()
+                _record(label, finished - started)
+                _finish(label, owner, finished)
+        return wrapper
+    return decorator
+
+def _timed_generator(label, generator):
+    elapsed = 0.0
+    try:
+        while True:
+            owner = _begin()
+            started = time.perf_counter()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                finished = time.perf_counter()
+                elapsed += finished - started
+                _finish(label, owner, finished)
+            yield item
+    finally:
+        generator.close()
+        _record(label, elapsed)
+
+def stats():
+    """Retorna uma cópia dos números acumulados.
+
+    Returns:
+        dict: ``timers`` (nome -> dict com ``calls``, ``total``, ``mean`` e
+            ``max``, em segundos), ``counters`` (nome -> valor) e ``slow``
+            (instruções lentas mais recentes, com ``call``, ``seconds``,
+            ``sql`` e ``plan``).
+    """
+    with _lock:
+        return {
+            "timers": {name: {"calls": calls, "total": total, "mean": total / calls, "max": longest}
+                       for name, (calls, total, longest) in _timers.items()},
+            "counters": dict(_counters),
+            "slow": list(_slow),
+        }
+
+def format_stats(snapshot=None, limit=20):
+    """Formata os números acumulados como texto.
+
+    Args:
+        snapshot (dict, optional): Resultado de ``stats()``; por padrão, o atual.
+        limit (int): Quantidade máxima de cronômetros (os de maior tempo total).
+
+    Returns:
+        str: Tabela de cronômetros, contadores e instruções lentas.
+    """
+    if snapshot is None:
+        snapshot = stats()
+    timers = sorted(snapshot["timers"].items(), key=lambda item: item[1]["total"], reverse=True)[:limit]
+    width = max((len(name) for name, _ in timers), default=10)
+    lines = [f"{'Chamada':<{width}}  {'Vezes':>7}  {'Total ms':>10}  {'Média ms':>9}  {'Máx. ms':>9}"]
+    for name, timer in timers:
+        lines.append(f"{name:<{width}}  {timer['calls']:>7}  {timer['total'] * 1000:>10.1f}  "
+                     f"{timer['mean'] * 1000:>9.2f}  {timer['max'] * 1000:>9.1f}")
+    for name, value in sorted(snapshot["counters"].items()):
+        lines.append(f"{name}: {value}")
+    for slow in snapshot["slow"]:
+        lines.append(f"Instrução lenta ({slow['seconds'] * 1000:.0f} ms em {slow['call']}): {slow['sql'][:200]}")
+        for detail in slow["plan"] or ():
+            lines.append(f"    {detail}")
+    return "\n".join(lines)
+
+def start_log(interval=60.0, file=None):
+    """Imprime ``format_stats()`` a cada ``interval`` segundos, em segundo plano.
+
+    Args:
+        interval (float): Intervalo entre as impressões, em segundos.
+        file (optional): Arquivo de saída; por padrão, a saída de erros.
+    """
+    global _log_thread, _log_stop
+    stop_log()
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            print(format_stats(), file=file or sys.stderr, flush=True)
+
+    _log_stop = stop
+    _log_thread = threading.Thread(target=run, name="instrumentation-log", daemon=True)
+    _log_thread.start()
+
+def stop_log():
+    """Interrompe a impressão iniciada por ``start_log``."""
+    global _log_thread, _log_stop
+    if _log_stop is not None:
+        _log_stop.set()
+        _log_thread.join()
+    _log_thread = _log_stop = None
@@ -1,14 +1,34 @@
 from controllers import FinancialController
-from views import FinanceDashboard
+import instrumentation
 import sys
 
+STATS_LOG_INTERVAL = 60
+"""Intervalo, em segundos, entre as impressões das medições com --stats."""
+
 if __name__ == "__main__":
     """Inicializa o sistema de controle financeiro."""
     db_file = "finance.db"
+    if "--stats" in sys.argv:
+        instrumentation.enable()
+        instrumentation.start_log(STATS_LOG_INTERVAL)
     try:
         controller = FinancialController(db_file)
+        if "--rebuild-totals" in sys.argv:
+            sys.exit(0 if controller.rebuild_totals() else 1)
+        if "--verify-totals" in sys.argv:
+            divergencias = controller.verify_totals()
+            for tabela, chave, armazenado, calculado in divergencias:
+                print(f"{tabela} [{chave}]: armazenado {armazenado:.2f}, calculado {calculado:.2f}")
+            print("Totais consistentes." if not divergencias else f"{len(divergencias)} divergência(s) encontrada(s).")
+            sys.exit(1 if divergencias else 0)
+        # Gera as transações recorrentes vencidas desde a última execução
+        controller.run_recurring_rules()
+        # A interface (Tk, customtkinter) só é carregada quando for exibida
+        from views import FinanceDashboard
         app = FinanceDashboard(controller)
         app.mainloop()
+        if instrumentation.is_enabled():
+            print(instrumentation.format_stats(), file=sys.stderr)
     except Exception as e:
         print(f"Erro ao iniciar o aplicativo: {e}")
         sys.exit(1)
\ No newline at end of file
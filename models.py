@@ -1,24 +1,438 @@
-class Transaction:
-    """Representa uma transação financeira."""
+import calendar
+from collections import namedtuple
+from datetime import date as _date, datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
 
-    def __init__(self, date, description, amount, type):
-        """Inicializa uma transação.
+DATE_FORMAT = "%Y-%m-%d"
+"""Formato canônico (ISO-8601) das datas gravadas no banco de dados."""
+
+
+def normalize_date(value):
+    """Converte uma data para o formato canônico ``AAAA-MM-DD``.
+
+    Args:
+        value (str | datetime.date | datetime.datetime): Data em ISO-8601,
+            no formato DD/MM/AAAA usado pelos campos de data da interface ou
+            como objeto de data.
+
+    Returns:
+        str: Data no formato ``AAAA-MM-DD``.
+
+    Raises:
+        ValueError: Se a data não estiver em um formato reconhecido.
+    """
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, _date):
+        return value.isoformat()
+    text = value.strip() if isinstance(value, str) else str(value).strip()
+    normalized = _normalize_date_text(text)
+    if normalized is None:
+        raise ValueError(f"Data inválida: {value!r}. Use DD/MM/AAAA ou AAAA-MM-DD.")
+    return normalized
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date_text(text):
+    """Converte o texto de uma data para ``AAAA-MM-DD``, ou None se for inválido.
+
+    Guardado em cache: extratos repetem as mesmas datas em muitas linhas, e
+    nas importações a validação das datas pesa tanto quanto a gravação.
+    """
+    try:
+        if len(text) == 10 and text[4] == "-":
+            # fromisoformat só valida; o texto já está no formato canônico
+            _date.fromisoformat(text)
+            return text
+        if len(text) == 10 and text[2] == "/" and text[5] == "/":
+            return _date(int(text[6:]), int(text[3:5]), int(text[:2])).isoformat()
+    except ValueError:
+        pass
+    return None
+
+
+TRANSACTION_TYPES = ("Receita", "Despesa")
+
+# Dígitos da parte inteira dos valores convertidos sem Decimal
+_PLAIN_AMOUNT_DIGITS = 15
+
+
+def _without_float(name):
+    """Operação de ``int`` que recusa um float como segundo operando (ver ``Money``)."""
+    operation = getattr(int, name)
+
+    def method(self, other):
+        return operation(self, self._check_float(other))
+
+    method.__name__ = name
+    return method
+
+
+class Money(int):
+    """Valor monetário exato, em centavos.
+
+    É um ``int`` (o número de centavos), então é gravado no banco como
+    INTEGER, ocupa o mesmo que um inteiro e soma sem erro de arredondamento;
+    somas e diferenças entre valores continuam sendo ``Money``. Nas contas
+    vale em centavos, como o int: ``float(Money(150))`` é 150.0 e
+    ``Money(150) / 100`` dá os reais como float. Só a exibição é em reais:
+    ``str(Money(123456))`` é "1234.56", ``format`` aceita as especificações
+    de ``Decimal`` (como ".2f") e ``reais`` dá o ``Decimal`` exato.
+
+    Para converter um valor em reais (texto, ``Decimal``, ``float`` ou
+    ``int``) use ``Money.from_value``; ``Money(n)`` interpreta ``n`` como
+    centavos. Um float como segundo operando de uma conta ou comparação
+    (``Money(150) + 1.5``, ``Money(150) < 2.0``) lança ``TypeError``, pois
+    quase sempre está em reais. Com o float à esquerda (``1.5 + Money(150)``)
+    o Python resolve a operação como entre float e int, sem consultar o
+    ``Money``: o resultado é um float em centavos, como ``float()``.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_value(cls, value):
+        """Converte um valor em reais, arredondando para o centavo mais próximo.
+
+        Args:
+            value (Money | Decimal | float | int | str): Valor em reais;
+                um ``Money`` é devolvido como está.
+
+        Returns:
+            Money: O valor em centavos.
+
+        Raises:
+            ValueError: Se o valor não for um número finito.
+        """
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, int) and not isinstance(value, bool):
+            return cls(value * 100)
+        if isinstance(value, float):
+            # repr dá o menor texto que volta ao mesmo float: 0.1 -> "0.1"
+            value = repr(value)
+        if isinstance(value, str):
+            # Caminho comum na importação: reais com até duas casas decimais,
+            # convertidos sem Decimal nem expressão regular
+            text = value.strip()
+            negative = text[:1] == "-"
+            whole, dot, fraction = text[negative:].partition(".")
+            if (whole.isdecimal() and len(whole) <= _PLAIN_AMOUNT_DIGITS
+                    and (not dot or (fraction.isdecimal() and len(fraction) <= 2))):
+                cents = int(whole) * 100 + (int(fraction.ljust(2, "0")) if dot else 0)
+                return cls(-cents if negative else cents)
+        try:
+            cents = (Decimal(str(value).strip()) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        except InvalidOperation:
+            raise ValueError(f"Valor inválido: {value!r}.") from None
+        if not cents.is_finite():
+            raise ValueError(f"Valor inválido: {value!r}.")
+        return cls(cents)
+
+    @property
+    def reais(self):
+        """O valor em reais, como ``Decimal`` exato."""
+        return Decimal(int(self)).scaleb(-2)
+
+    def __str__(self):
+        cents = int(self)
+        sign = "-" if cents < 0 else ""
+        return f"{sign}{abs(cents) // 100}.{abs(cents) % 100:02d}"
+
+    def __repr__(self):
+        return f"Money('{self}')"
+
+    def __format__(self, spec):
+        return format(self.reais, spec) if spec else str(self)
+
+    def __float__(self):
+        return float(int(self))
+
+    @staticmethod
+    def _check_float(other):
+        # Com float, o Python misturaria os centavos com um valor em reais
+        if isinstance(other, float):
+            raise TypeError("Money não pode ser combinado com float; use Money.from_value.")
+        return other
+
+    def _check(self, other):
+        if isinstance(self._check_float(other), int) and not isinstance(other, bool):
+            return int(other)
+        return None
+
+    def __add__(self, other):
+        other = self._check(other)
+        return NotImplemented if other is None else Money(int(self) + other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        other = self._check(other)
+        return NotImplemented if other is None else Money(int(self) - other)
+
+    def __rsub__(self, other):
+        other = self._check(other)
+        return NotImplemented if other is None else Money(other - int(self))
+
+    def __mul__(self, other):
+        if isinstance(self._check_float(other), int) and not isinstance(other, (bool, Money)):
+            return Money(int(self) * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    __truediv__ = _without_float("__truediv__")
+    __floordiv__ = _without_float("__floordiv__")
+    __lt__ = _without_float("__lt__")
+    __le__ = _without_float("__le__")
+    __gt__ = _without_float("__gt__")
+    __ge__ = _without_float("__ge__")
+
+    def __neg__(self):
+        return Money(-int(self))
+
+    def __abs__(self):
+        return Money(abs(int(self)))
+
+
+def validate_amount(amount):
+    """Converte e valida o valor de uma transação.
+
+    Args:
+        amount (Money | Decimal | float | int | str): Valor em reais.
+
+    Returns:
+        Money: O valor em centavos.
+
+    Raises:
+        ValueError: Se o valor não for numérico ou for negativo.
+    """
+    amount = Money.from_value(amount)
+    # Comparado como int: a comparação do Money passa por Python
+    if int(amount) < 0:
+        raise ValueError("O valor da transação não pode ser negativo.")
+    return amount
+
+
+def validate_type(type):
+    """Valida o tipo de uma transação.
+
+    Raises:
+        ValueError: Se o tipo não for 'Receita' nem 'Despesa'.
+    """
+    if type not in TRANSACTION_TYPES:
+        raise ValueError("Tipo de transação inválido. Deve ser 'Receita' ou 'Despesa'.")
+    return type
+
+
+def validate_reference(value, label="Referência"):
+    """Valida o id opcional de uma categoria ou conta.
+
+    Args:
+        value (int | str | None): ID (ou texto com o ID); None ou texto vazio
+            indicam que a transação não tem a referência.
+        label (str): Nome do campo, usado na mensagem de erro.
+
+    Returns:
+        int: O ID, ou None.
+
+    Raises:
+        ValueError: Se o valor não for um inteiro positivo.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise ValueError(f"{label} inválida: {value!r}.")
+    return value
+
+
+class Transaction(namedtuple("Transaction", ("id", "date", "description", "amount", "type", "category_id",
+                                             "account_id"), defaults=(None, None))):
+    """Representa uma transação financeira.
+
+    É uma tupla nomeada (id, date, description, amount, type, category_id,
+    account_id), sem ``__dict__`` por instância: ocupa o mesmo que a tupla lida do banco,
+    continua desempacotável como ela e os campos são lidos pelo nome
+    (``transaction.amount``) em vez da posição. As consultas do banco montam
+    as instâncias diretamente (ver ``database.transaction_row``), com o
+    valor já como ``Money``; para criar uma a partir de dados digitados ou
+    importados, use ``Transaction.create``, que os valida.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def create(cls, date, description, amount, type, category_id=None, account_id=None, id=None):
+        """Valida os campos e cria a transação.
 
         Args:
-            date (str): Data da transação.
+            date (str): Data da transação (DD/MM/AAAA ou AAAA-MM-DD).
             description (str): Descrição da transação.
-            amount (float): Valor da transação.
+            amount (Money | float | str): Valor da transação, em reais.
             type (str): Tipo da transação (Receita/Despesa).
+            category_id (int, optional): ID da categoria.
+            account_id (int, optional): ID da conta.
+            id (int, optional): ID da transação, se já gravada.
+
+        Returns:
+            Transaction: A transação com os campos normalizados.
 
         Raises:
-            ValueError: Se o valor for negativo ou o tipo for inválido.
+            ValueError: Se o valor for negativo, o tipo ou a data forem inválidos.
+        """
+        return cls(id, *cls.validate(date, description, amount, type, category_id, account_id))
+
+    @staticmethod
+    def validate(date, description, amount, type, category_id=None, account_id=None):
+        """Valida e normaliza os campos de uma transação sem criar o objeto.
+
+        Usado na importação em lote, onde cada linha precisa das mesmas
+        regras de ``Transaction`` mas é gravada diretamente como tupla. Datas
+        ISO e valores com até duas casas decimais são validados sem passar
+        por ``datetime`` ou ``Decimal``.
+
+        Args:
+            date (str): Data da transação (DD/MM/AAAA ou AAAA-MM-DD).
+            description (str): Descrição da transação.
+            amount (Money | float | str): Valor da transação, em reais.
+            type (str): Tipo da transação (Receita/Despesa).
+            category_id (int, optional): ID da categoria.
+            account_id (int, optional): ID da conta.
+
+        Returns:
+            tuple: (date, description, amount, type, category_id, account_id)
+                normalizados, na ordem das colunas gravadas.
+
+        Raises:
+            ValueError: Se o valor for negativo, o tipo, a data ou as
+                referências forem inválidos.
+        """
+        return (normalize_date(date), description, validate_amount(amount), validate_type(type),
+                validate_reference(category_id, "Categoria"), validate_reference(account_id, "Conta"))
+
+
+FREQUENCIES = ("daily", "weekly", "monthly", "yearly")
+"""Frequências aceitas para as transações recorrentes."""
+
+# Dias entre ocorrências das frequências contadas em dias e meses entre as das
+# contadas em meses
+_FREQUENCY_DAYS = {"daily": 1, "weekly": 7}
+_FREQUENCY_MONTHS = {"monthly": 1, "yearly": 12}
+
+
+class RecurringRule(namedtuple("RecurringRule", ("id", "description", "amount", "type", "category_id",
+                                                 "account_id", "frequency", "interval", "start_date",
+                                                 "end_date", "next_date"))):
+    """Regra de uma transação recorrente (aluguel, salário, assinatura).
+
+    A cada ``interval`` dias, semanas, meses ou anos a partir de
+    ``start_date`` (e até ``end_date``, se houver), a regra gera uma
+    transação com a mesma descrição, valor, tipo, categoria e conta.
+    ``next_date`` é a próxima ocorrência ainda não gerada, ou None quando
+    a regra terminou. Nas frequências mensal e anual o dia é o de
+    ``start_date``, limitado ao último dia do mês: uma regra iniciada em
+    31/01 ocorre em 28/02 (ou 29/02) e volta a 31/03.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def create(cls, description, amount, type, frequency, start_date, interval=1, end_date=None,
+               category_id=None, account_id=None, id=None):
+        """Valida os campos e cria a regra, com a primeira ocorrência em ``start_date``.
+
+        Args:
+            description (str): Descrição das transações geradas.
+            amount (Money | float | str): Valor de cada transação, em reais.
+            type (str): Tipo das transações (Receita/Despesa).
+            frequency (str): Um dos valores de ``FREQUENCIES``.
+            start_date (str): Data da primeira ocorrência (DD/MM/AAAA ou AAAA-MM-DD).
+            interval (int): Quantidade de períodos entre as ocorrências.
+            end_date (str, optional): Data após a qual não há ocorrências.
+            category_id (int, optional): ID da categoria.
+            account_id (int, optional): ID da conta.
+            id (int, optional): ID da regra, se já gravada.
+
+        Returns:
+            RecurringRule: A regra com os campos normalizados.
+
+        Raises:
+            ValueError: Se algum campo for inválido ou ``end_date`` for
+                anterior a ``start_date``.
+        """
+        start_date, description, amount, type, category_id, account_id = Transaction.validate(
+            start_date, description, amount, type, category_id, account_id)
+        if frequency not in FREQUENCIES:
+            raise ValueError(f"Frequência inválida: {frequency!r}. Use uma de: {', '.join(FREQUENCIES)}.")
+        if isinstance(interval, str) and interval.strip().isdigit():
+            interval = int(interval)
+        if not isinstance(interval, int) or isinstance(interval, bool) or interval <= 0:
+            raise ValueError(f"Intervalo inválido: {interval!r}.")
+        if end_date is not None and end_date != "":
+            end_date = normalize_date(end_date)
+            if end_date < start_date:
+                raise ValueError("A data final não pode ser anterior à data inicial.")
+        else:
+            end_date = None
+        return cls(id, description, amount, type, category_id, account_id, frequency, interval,
+                   start_date, end_date, start_date)
+
+    def occurrence(self, index):
+        """Calcula a data de uma ocorrência.
+
+        Args:
+            index (int): Posição da ocorrência; 0 é ``start_date``.
+
+        Returns:
+            datetime.date: A data da ocorrência.
+        """
+        start = _date.fromisoformat(self.start_date)
+        if self.frequency in _FREQUENCY_DAYS:
+            return start + timedelta(days=_FREQUENCY_DAYS[self.frequency] * self.interval * index)
+        months = start.month - 1 + _FREQUENCY_MONTHS[self.frequency] * self.interval * index
+        year, month = start.year + months // 12, months % 12 + 1
+        return _date(year, month, min(start.day, calendar.monthrange(year, month)[1]))
+
+    def _next_index(self):
+        """Posição da ocorrência em ``next_date``."""
+        start = _date.fromisoformat(self.start_date)
+        next_date = _date.fromisoformat(self.next_date)
+        if self.frequency in _FREQUENCY_DAYS:
+            step = _FREQUENCY_DAYS[self.frequency] * self.interval
+            return max(-(-(next_date - start).days // step), 0)
+        step = _FREQUENCY_MONTHS[self.frequency] * self.interval
+        index = max(((next_date.year - start.year) * 12 + next_date.month - start.month) // step, 0)
+        # O dia limitado ao fim do mês pode deixar a estimativa uma ocorrência atrás
+        while self.occurrence(index) < next_date:
+            index += 1
+        return index
+
+    def due_dates(self, until):
+        """Lista as ocorrências ainda não geradas até uma data.
+
+        A posição de ``next_date`` é calculada diretamente, então o custo
+        depende só da quantidade de ocorrências devidas, mesmo depois de
+        longos períodos sem gerá-las.
+
+        Args:
+            until (str): Data limite, inclusiva, no formato ``AAAA-MM-DD``.
+
+        Returns:
+            tuple: (datas devidas em ``AAAA-MM-DD``, novo ``next_date`` ou
+                None se a regra terminou).
         """
-        if amount < 0:
-            raise ValueError("O valor da transação não pode ser negativo.")
-        if type not in ["Receita", "Despesa"]:
-            raise ValueError("Tipo de transação inválido. Deve ser 'Receita' ou 'Despesa'.")
-
-        self.date = date
-        self.description = description
-        self.amount = amount
-        self.type = type
\ No newline at end of file
+        if self.next_date is None:
+            return [], None
+        limit = min(until, self.end_date) if self.end_date is not None else until
+        dates = []
+        index = self._next_index()
+        while True:
+            day = self.occurrence(index).isoformat()
+            if day > limit:
+                break
+            dates.append(day)
+            index += 1
+        return dates, day if self.end_date is None or day <= self.end_date else None
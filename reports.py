@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+
+from models import TRANSACTION_TYPES, Money
+
+PERIODS = ("day", "week", "month", "year")
+"""Períodos aceitos para o agrupamento dos relatórios."""
+
+# Unidade NumPy em que cada período é representado; semanas são contadas em
+# dias e alinhadas à segunda-feira
+_PERIOD_UNITS = {"day": "D", "week": "D", "month": "M", "year": "Y"}
+_PERIOD_STEPS = {"day": 1, "week": 7, "month": 1, "year": 1}
+
+# Posição de cada tipo em TRANSACTION_TYPES, usada como código nos arrays
+_INCOME = TRANSACTION_TYPES.index("Receita")
+_EXPENSE = TRANSACTION_TYPES.index("Despesa")
+
+def period_keys(dates, period):
+    """Converte datas no início do período a que pertencem.
+
+    Args:
+        dates (np.ndarray): Datas em ``datetime64``.
+        period (str): Um dos valores de ``PERIODS``.
+
+    Returns:
+        np.ndarray: Início de cada período, como inteiros na unidade do
+            período (dias, meses ou anos desde 1970).
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Período inválido: {period}. Use um de: {', '.join(PERIODS)}.")
+    keys = dates.astype(f"datetime64[{_PERIOD_UNITS[period]}]").view(np.int64)
+    if period == "week":
+        # 1970-01-01 foi uma quinta-feira: somar 3 alinha o resto à segunda
+        keys = keys - (keys + 3) % 7
+    return keys
+
+def _sum_by(offsets, values, size):
+    """Soma ``values`` agrupados por ``offsets`` em int64, sem passar por float."""
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, offsets, values)
+    return sums
+
+def _aggregate_chunk(keys, amounts, types):
+    """Soma um bloco por período, em centavos inteiros (int64).
+
+    Returns:
+        tuple: (períodos presentes, receitas, despesas, quantidades).
+    """
+    base = keys.min()
+    offsets = keys - base
+    counts = np.bincount(offsets)
+    income = _sum_by(offsets, np.where(types == _INCOME, amounts, 0), len(counts))
+    expenses = _sum_by(offsets, np.where(types == _EXPENSE, amounts, 0), len(counts))
+    present = np.flatnonzero(counts)
+    return present + base, income[present], expenses[present], counts[present]
+
+def compute_report(chunks, period="month", opening_balance=0, monthly=None):
+    """Calcula o fluxo líquido e o saldo acumulado por período.
+
+    Os blocos são agregados um a um, de modo que a memória usada depende
+    do tamanho de cada bloco e da quantidade de períodos, não do total de
+    transações.
+
+    Args:
+        chunks (iterable): Blocos com os arrays ``date`` (``datetime64``),
+            ``amount`` (``int64``, em centavos) e ``type`` (código do tipo em
+            ``TRANSACTION_TYPES``), como os de
+            ``FinancialController.iter_transaction_arrays``.
+        period (str): Um dos valores de ``PERIODS``.
+        opening_balance (int): Saldo anterior ao primeiro período, em
+            centavos (um ``Money``).
+        monthly (dict, optional): Meses já agregados, somados aos blocos:
+            arrays ``month`` (``datetime64[M]``), ``Receita``, ``Despesa``
+            (em centavos) e ``count``. Só vale para os períodos "month" e
+            "year".
+
+    Returns:
+        pd.DataFrame: Uma linha por período, do primeiro ao último com
+            movimento (inclusive os vazios entre eles), indexada pela data de
+            início do período, com as colunas de cada tipo, ``net``
+            (receitas menos despesas), ``balance`` (saldo ao fim do período)
+            e ``count``. Os valores são somados em centavos inteiros (int64)
+            e só então convertidos para reais (float64).
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Período inválido: {period}. Use um de: {', '.join(PERIODS)}.")
+    parts = []
+    if monthly is not None and len(monthly["month"]):
+        if period not in ("month", "year"):
+            raise ValueError("Agregados mensais só podem compor relatórios por mês ou ano.")
+        parts.append((period_keys(monthly["month"], period), monthly["Receita"], monthly["Despesa"],
+                      monthly["count"]))
+    for chunk in chunks:
+        if not len(chunk["date"]):
+            continue
+        keys = period_keys(chunk["date"], period)
+        parts.append(_aggregate_chunk(keys, chunk["amount"], chunk["type"]))
+
+    unit = _PERIOD_UNITS[period]
+    step = _PERIOD_STEPS[period]
+    if parts:
+        keys, income, expenses, counts = (np.concatenate(values) for values in zip(*parts))
+        first = keys.min()
+        # Todos os períodos do intervalo, inclusive os sem movimento
+        buckets = np.arange(first, keys.max() + 1, step)
+        offsets = (keys - first) // step
+        size = len(buckets)
+        income = _sum_by(offsets, income, size)
+        expenses = _sum_by(offsets, expenses, size)
+        counts = _sum_by(offsets, counts, size)
+    else:
+        buckets = np.empty(0, dtype=np.int64)
+        income = expenses = counts = np.empty(0, dtype=np.int64)
+
+    net = income - expenses
+    balance = int(opening_balance) + np.cumsum(net)
+    index = pd.DatetimeIndex(buckets.astype(f"datetime64[{unit}]").astype("datetime64[ns]"), name="period")
+    return pd.DataFrame({
+        "Receita": income / 100,
+        "Despesa": expenses / 100,
+        "net": net / 100,
+        "balance": balance / 100,
+        "count": counts,
+    }, index=index)
+
+def report_totals(report):
+    """Resume um relatório em totais por tipo.
+
+    Args:
+        report (pd.DataFrame): Resultado de ``compute_report``.
+
+    Returns:
+        dict: Mapeamento tipo -> soma no intervalo do relatório (``Money``),
+            somada em centavos.
+    """
+    return {type: Money(int(np.rint(report[type].to_numpy() * 100).astype(np.int64).sum()))
+            for type in TRANSACTION_TYPES}
@@ -0,0 +1,23 @@
+import pytest
+
+from controllers import FinancialController
+
+
+@pytest.fixture
+def open_controller(tmp_path):
+    """Abre controladores em bancos temporários, fechados no fim do teste."""
+    controllers = []
+
+    def open_database(name="finance.db"):
+        controller = FinancialController(str(tmp_path / name))
+        controllers.append(controller)
+        return controller
+
+    yield open_database
+    for controller in controllers:
+        controller.close()
+
+
+@pytest.fixture
+def controller(open_controller):
+    return open_controller()
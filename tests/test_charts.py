@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from charts import balance_data
+
+
+@pytest.fixture
+def ledger(controller):
+    controller.import_transactions([
+        ("2025-01-05", "Salário", "5000", "Receita"),
+        ("2025-01-05", "Mercado", "320.45", "Despesa"),
+        ("2025-01-09", "Padaria", "12.30", "Despesa"),
+        ("2025-02-01", "Aluguel", "1800", "Despesa"),
+    ])
+    return controller
+
+
+def test_empty_database(controller):
+    dates, balances = balance_data(controller, 800)
+    assert len(dates) == len(balances) == 0
+
+
+def test_balance_matches_daily_report(ledger):
+    removed = ledger.add_transaction("2025-01-20", "Estornada", 99, "Despesa")
+    ledger.delete_transaction(removed)
+    report = ledger.generate_report("day")
+
+    dates, balances = balance_data(ledger, 800)
+
+    assert np.array_equal(dates, report.index.to_numpy().astype("datetime64[D]"))
+    assert np.allclose(balances, report["balance"].to_numpy())
+    assert (balances[0], balances[-1]) == (4679.55, 2867.25)
@@ -0,0 +1,56 @@
+import sqlite3
+
+import pytest
+
+import cli
+import controllers
+import database
+
+
+def run(tmp_path, capsys, *argv):
+    status = cli.main(["--db", str(tmp_path / "finance.db"), *argv])
+    out, err = capsys.readouterr()
+    return status, out, err
+
+
+def test_rejected_add_leaves_no_category(tmp_path, capsys, open_controller):
+    status, out, err = run(tmp_path, capsys, "add", "2025-01-05", "Mercado", "-10", "Despesa",
+                           "--category", "Nova", "--account", "Carteira")
+
+    assert status == 1
+    assert out == ""
+    assert "Erro ao adicionar transação" in err
+    controller = open_controller()
+    assert controller.get_categories() == [] and controller.get_accounts() == []
+
+
+def test_add_creates_category_with_transaction(tmp_path, capsys):
+    status, out, _ = run(tmp_path, capsys, "add", "2025-01-05", "Mercado", "10", "Despesa", "--category", "Nova")
+
+    assert (status, out) == (0, "1\n")
+    assert run(tmp_path, capsys, "breakdown")[1].split()[:2] == ["Despesa", "Nova"]
+
+
+def test_controller_errors_go_to_stderr(tmp_path, capsys, monkeypatch):
+    run(tmp_path, capsys, "add", "2025-01-05", "Mercado", "10", "Despesa")
+    empty = sqlite3.connect(":memory:")
+    # O banco falha ao ler os totais: fetch_totals informa o erro e devolve {}
+    monkeypatch.setattr(controllers, "fetch_totals", lambda conn: database.fetch_totals(empty))
+
+    status, out, err = run(tmp_path, capsys, "balance")
+
+    assert status == 1
+    assert "Erro ao recuperar totais" not in out
+    assert "Erro ao recuperar totais" in err
+
+
+def test_amount_filters_in_reais(tmp_path, capsys):
+    for amount in ("10.49", "10.50", "10.51"):
+        run(tmp_path, capsys, "add", "2025-01-05", f"Valor {amount}", amount, "Despesa")
+
+    status, out, _ = run(tmp_path, capsys, "query", "--min-amount", "10.50", "--max-amount", "10.5")
+
+    assert status == 0
+    assert [line.split(",")[2] for line in out.splitlines()[1:]] == ["Valor 10.50"]
+    with pytest.raises(SystemExit):
+        run(tmp_path, capsys, "query", "--min-amount", "dez")
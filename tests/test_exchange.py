@@ -0,0 +1,70 @@
+import pytest
+
+
+@pytest.fixture
+def source(open_controller):
+    controller = open_controller("source.db")
+    groceries = controller.add_category("Mercado")
+    card = controller.add_account("Cartão de Crédito")
+    controller.import_transactions([
+        ("2025-01-05", "Salário", "5000", "Receita", None, controller.add_account("Conta Corrente")),
+        ("2025-01-06", "Supermercado", "320.45", "Despesa", groceries, card),
+        ("2025-01-07", "Padaria", "12.30", "Despesa", groceries, None),
+        ("2025-01-08", "Sem nada", "1", "Despesa"),
+    ])
+    return controller
+
+
+def rows_by_name(controller):
+    categories = dict(controller.get_categories())
+    accounts = dict(controller.get_accounts())
+    return [(t.date, t.description, t.amount, t.type, categories.get(t.category_id), accounts.get(t.account_id))
+            for t in controller.get_transactions()]
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".arrow"])
+def test_export_and_import_keep_category_and_account(tmp_path, open_controller, source, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"export{extension}")
+    assert source.export_transactions(path)[0] == 4
+
+    target = open_controller("target.db")
+    # Os ids do destino não coincidem com os da origem
+    target.add_category("Outra")
+    target.add_account("Poupança")
+    assert target.import_file(path) == (4, [])
+    assert rows_by_name(target) == rows_by_name(source)
+
+
+def test_import_matches_existing_names_case_insensitively(tmp_path, open_controller, source):
+    path = str(tmp_path / "export.csv")
+    source.export_transactions(path)
+    target = open_controller("target.db")
+    mercado = target.add_category("MERCADO")
+    target.import_file(path)
+    assert [name for _, name in target.get_categories()] == ["MERCADO"]
+    assert sum(t.category_id == mercado for t in target.get_transactions()) == 2
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_incremental_export_round_trip(tmp_path, open_controller, source, extension):
+    if extension != ".csv":
+        pytest.importorskip("pyarrow")
+    target = open_controller("target.db")
+    first = str(tmp_path / f"first{extension}")
+    count, watermark = source.export_transactions(first)
+    assert count == 4
+    assert target.import_file(first) == (4, [])
+
+    # Sem transações novas, a exportação fica vazia e a marca não muda
+    assert source.export_transactions(str(tmp_path / f"empty{extension}"), since_id=watermark) == (0, watermark)
+    source.add_transaction("2025-01-09", "Farmácia", "45.90", "Despesa", category_id=source.add_category("Saúde"))
+    second = str(tmp_path / f"second{extension}")
+    count, watermark = source.export_transactions(second, since_id=watermark)
+    assert count == 1
+    assert target.import_file(second) == (1, [])
+
+    assert rows_by_name(target) == rows_by_name(source)
+    assert target.get_balance() == source.get_balance()
+    assert target.verify_totals() == []
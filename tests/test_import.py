@@ -0,0 +1,40 @@
+import pytest
+
+from database import fts5_available
+from models import Money
+
+
+def schema_objects(controller):
+    return set(controller.conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE tbl_name = 'transactions' AND sql IS NOT NULL"))
+
+
+def test_bulk_import_restores_indexes_and_triggers(controller):
+    before = schema_objects(controller)
+    rows = [("2025-01-%02d" % (number % 28 + 1), f"Mercado {number}", "10.50", "Despesa") for number in range(300)]
+    # Categoria inexistente: o segundo lote falha e é gravado linha a linha
+    rows.insert(149, ("2025-02-01", "Sem categoria válida", "1", "Despesa", 999))
+
+    inserted, rejects = controller.import_transactions(rows, batch_size=100)
+
+    assert inserted == 300
+    assert [position for position, _, _ in rejects] == [150]
+    assert schema_objects(controller) == before
+    assert controller.verify_totals() == []
+    assert controller.get_balance() == Money.from_value("-3150")
+    if fts5_available(controller.conn):
+        assert [t.description for t in controller.search("Mercado 299")] == ["Mercado 299"]
+
+
+def test_small_import_keeps_indexes(controller):
+    controller.import_transactions([("2025-01-01", f"Aluguel {number}", "100", "Despesa") for number in range(100)])
+    before = schema_objects(controller)
+    controller.conn.execute("CREATE TEMP TRIGGER watch_drop BEFORE INSERT ON main.transactions "
+                            "WHEN (SELECT COUNT(*) FROM sqlite_master WHERE name = 'idx_transactions_date') = 0 "
+                            "BEGIN SELECT RAISE(ABORT, 'índices removidos'); END")
+
+    inserted, rejects = controller.import_transactions([("2025-01-02", "Luz", "80", "Despesa")])
+
+    assert (inserted, rejects) == (1, [])
+    assert schema_objects(controller) == before
+    assert controller.verify_totals() == []
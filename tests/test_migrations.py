@@ -0,0 +1,126 @@
+import sqlite3
+
+import pytest
+
+from controllers import FinancialController
+from database import _MIGRATIONS, fts5_available
+from models import Money
+
+# Esquema criado pelo database.create_table original, com datas em DD/MM/AAAA
+# e valores em reais (REAL)
+BASELINE_SCHEMA = """CREATE TABLE transactions (
+                         id INTEGER PRIMARY KEY AUTOINCREMENT,
+                         date TEXT NOT NULL,
+                         description TEXT NOT NULL,
+                         amount REAL NOT NULL,
+                         type TEXT NOT NULL
+                     )"""
+
+BASELINE_ROWS = [
+    ("03/03/2025", "Salário", 1200.0, "Receita"),
+    ("23/03/2025", "Agiota", 500.0, "Despesa"),
+    ("02/04/2025", "Mercado", 10.1, "Despesa"),
+]
+
+
+def make_database(path, schema, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(schema)
+    conn.executemany("INSERT INTO transactions(date, description, amount, type) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def controller_for(tmp_path, open_controller):
+    def open_database(schema, rows=BASELINE_ROWS):
+        make_database(str(tmp_path / "finance.db"), schema, rows)
+        return open_controller()
+
+    return open_database
+
+
+def test_baseline_database_is_migrated(controller_for):
+    controller = controller_for(BASELINE_SCHEMA)
+
+    assert controller.conn.execute("PRAGMA user_version").fetchone()[0] == len(_MIGRATIONS)
+    transactions = controller.get_transactions()
+    assert [(t.date, t.amount) for t in transactions] == [
+        ("2025-03-03", Money(120000)), ("2025-03-23", Money(50000)), ("2025-04-02", Money(1010))]
+    assert controller.get_total_income() == Money(120000)
+    assert controller.get_total_expenses() == Money(51010)
+    assert controller.verify_totals() == []
+    assert controller.generate_report("month")["Despesa"].tolist() == [500.0, 10.1]
+
+
+def test_new_transactions_after_migration(controller_for):
+    controller = controller_for(BASELINE_SCHEMA)
+
+    transaction_id = controller.add_transaction("2025-04-05", "Aluguel", "1500", "Despesa")
+    assert transaction_id == len(BASELINE_ROWS) + 1
+    assert controller.get_total_expenses() == Money(201010)
+    assert controller.verify_totals() == []
+
+
+def test_schema_failure_is_fatal(tmp_path):
+    path = str(tmp_path / "finance.db")
+    conn = sqlite3.connect(path)
+    # Uma tabela de totais incompatível impede a criação dos gatilhos
+    conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, date TEXT, description TEXT, amount REAL, "
+                 "type TEXT)")
+    conn.execute("CREATE TABLE daily_totals (x)")
+    conn.execute("INSERT INTO transactions(date, description, amount, type) VALUES ('2025-01-01', 'a', 1, 'Receita')")
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(sqlite3.Error):
+        FinancialController(path)
+    conn = sqlite3.connect(path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+    conn.close()
+
+
+def test_database_without_autoincrement(controller_for):
+    # Como o finance.db distribuído: sem AUTOINCREMENT, não há sqlite_sequence
+    schema = BASELINE_SCHEMA.replace(" AUTOINCREMENT", "")
+    controller = controller_for(schema)
+
+    assert controller.get_total_income() == Money(120000)
+    assert [t.amount for t in controller.get_transactions()] == [Money(120000), Money(50000), Money(1010)]
+    assert controller.add_transaction("2025-04-05", "Aluguel", "1500", "Despesa") == len(BASELINE_ROWS) + 1
+
+
+def test_unmigrated_amounts_are_refused(tmp_path):
+    path = str(tmp_path / "finance.db")
+    make_database(path, BASELINE_SCHEMA, BASELINE_ROWS)
+    conn = sqlite3.connect(path)
+    # Versão registrada como migrada, mas com a coluna ainda em reais
+    conn.execute(f"PRAGMA user_version = {len(_MIGRATIONS)}")
+    conn.close()
+
+    with pytest.raises(sqlite3.DatabaseError):
+        FinancialController(path)
+
+
+def test_search_index_prefixes_are_dropped(tmp_path, controller_for, open_controller):
+    controller = controller_for(BASELINE_SCHEMA)
+    if not fts5_available(controller.conn):
+        pytest.skip("SQLite sem FTS5")
+    controller.close()
+    # Índice de texto como era criado antes, com índices de prefixo
+    conn = sqlite3.connect(str(tmp_path / "finance.db"))
+    conn.execute("DROP TABLE transactions_fts")
+    conn.execute("CREATE VIRTUAL TABLE transactions_fts USING fts5(description, content='transactions', "
+                 "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+    conn.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+    conn.execute(f"PRAGMA user_version = {len(_MIGRATIONS) - 1}")
+    conn.commit()
+    conn.close()
+
+    controller = open_controller()
+
+    sql, = controller.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'transactions_fts'").fetchone()
+    assert "prefix" not in sql
+    assert [t.description for t in controller.search("merc")] == ["Mercado"]
+    controller.add_transaction("2025-04-05", "Mercearia", "15", "Despesa")
+    assert sorted(t.description for t in controller.search("merc")) == ["Mercado", "Mercearia"]
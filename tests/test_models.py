@@ -0,0 +1,54 @@
+import pytest
+
+from models import Money
+
+
+@pytest.mark.parametrize("operation", [
+    lambda money: money + 1.5,
+    lambda money: money - 1.5,
+    lambda money: money * 1.5,
+    lambda money: money / 2.0,
+    lambda money: money // 2.0,
+    lambda money: money < 2.0,
+    lambda money: money <= 2.0,
+    lambda money: money > 2.0,
+    lambda money: money >= 2.0,
+])
+def test_float_operand_is_refused(operation):
+    with pytest.raises(TypeError):
+        operation(Money(150))
+
+
+def test_arithmetic_is_in_cents():
+    money = Money(150)
+
+    assert float(money) == 150.0
+    assert money / 2 == 75.0
+    assert money / 100 == 1.5
+    assert 1.5 + money == 151.5
+    assert money < 200 and money > Money(149)
+
+
+def test_money_stays_money():
+    assert Money(150) + 50 == Money(200) and isinstance(Money(150) + 50, Money)
+    assert isinstance(100 - Money(150), Money)
+    assert Money(150) * 3 == Money(450) and isinstance(3 * Money(150), Money)
+    assert sum([Money(1), Money(2)], Money(0)) == Money(3)
+
+
+@pytest.mark.parametrize("value, cents", [
+    ("1234.56", 123456),
+    ("-0.5", -50),
+    (0.1, 10),
+    (2.675, 268),
+    (7, 700),
+    ("1e3", 100000),
+])
+def test_from_value(value, cents):
+    assert Money.from_value(value) == Money(cents)
+
+
+def test_display_is_in_reais():
+    assert str(Money(-123456)) == "-1234.56"
+    assert f"{Money(5):.2f}" == "0.05"
+    assert repr(Money(100)) == "Money('1.00')"
@@ -0,0 +1,41 @@
+import pytest
+
+from database import SORTABLE_COLUMNS
+
+
+@pytest.fixture
+def ledger(controller):
+    # Valores e datas repetidos, para que a ordem dependa do desempate por id
+    controller.import_transactions([("2025-01-%02d" % (number % 7 + 1), f"Compra {number}", str(number % 5 * 10),
+                                     "Despesa" if number % 3 else "Receita") for number in range(53)])
+    return controller
+
+
+def walk(controller, order_by, descending=False, limit=10, **filters):
+    pages = []
+    after = None
+    while True:
+        page = controller.get_transactions_page(order_by, descending, after, limit, **filters)
+        if not page:
+            return pages
+        pages.append(page)
+        last = page[-1]
+        after = (getattr(last, order_by), last.id)
+
+
+@pytest.mark.parametrize("order_by", SORTABLE_COLUMNS)
+@pytest.mark.parametrize("descending", [False, True])
+def test_pages_cover_every_transaction_once(ledger, order_by, descending):
+    expected = sorted(ledger.get_transactions(), key=lambda t: (getattr(t, order_by), t.id), reverse=descending)
+
+    pages = walk(ledger, order_by, descending)
+
+    assert [len(page) for page in pages] == [10] * 5 + [3]
+    assert [t.id for page in pages for t in page] == [t.id for t in expected]
+
+
+def test_pages_apply_filters(ledger):
+    pages = walk(ledger, "amount", type="Receita", limit=4)
+
+    income = [t for t in ledger.get_transactions() if t.type == "Receita"]
+    assert [t.id for page in pages for t in page] == [t.id for t in sorted(income, key=lambda t: (t.amount, t.id))]
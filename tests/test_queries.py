@@ -0,0 +1,21 @@
+import controllers
+from models import Money
+
+
+def test_rows_and_totals_come_from_one_snapshot(controller, monkeypatch):
+    controller.add_transaction("2025-01-05", "Mercado", "100", "Despesa")
+    original = controllers.query_transactions
+
+    def query_then_write(*args, **kwargs):
+        rows = original(*args, **kwargs)
+        monkeypatch.setattr(controllers, "query_transactions", original)
+        # Uma gravação de outra thread entre as duas consultas
+        controller.add_transaction("2025-01-06", "Padaria", "20", "Despesa")
+        return rows
+
+    monkeypatch.setattr(controllers, "query_transactions", query_then_write)
+    rows, summary = controller.query_transactions(type="Despesa")
+
+    assert [t.description for t in rows] == ["Mercado"]
+    assert summary == {"Despesa": (Money.from_value("100"), 1)}
+    assert controller.query_transactions(type="Despesa")[1] == {"Despesa": (Money.from_value("120"), 2)}
@@ -0,0 +1,39 @@
+from models import Money
+
+
+def generated(controller):
+    return [(t.date, t.description, t.amount) for t in controller.get_transactions()]
+
+
+def test_monthly_rule_keeps_the_start_day(controller):
+    controller.add_recurring_rule("Aluguel", "1500", "Despesa", "monthly", "2024-01-31")
+
+    assert controller.run_recurring_rules("2024-05-15") == 4
+    assert [day for day, _, _ in generated(controller)] == ["2024-01-31", "2024-02-29", "2024-03-31",
+                                                            "2024-04-30"]
+    rule, = controller.get_recurring_rules()
+    assert rule.next_date == "2024-05-31"
+    assert controller.get_total_expenses() == Money.from_value("6000")
+    assert controller.verify_totals() == []
+
+
+def test_occurrences_are_generated_once(controller):
+    controller.add_recurring_rule("Academia", "99.90", "Despesa", "weekly", "2025-01-06", interval=2)
+    controller.add_recurring_rule("Salário", "5000", "Receita", "monthly", "2025-01-05", end_date="2025-02-28")
+
+    assert controller.run_recurring_rules("2025-02-10") == 5
+    assert controller.run_recurring_rules("2025-02-10") == 0
+    # Uma ocorrência removida não volta a ser gerada
+    january, = [t for t in controller.get_transactions() if t.description == "Salário" and t.date == "2025-01-05"]
+    assert controller.delete_transaction(january.id)
+    assert controller.run_recurring_rules("2025-03-31") == 4
+
+    academia, salario = Money.from_value("99.90"), Money.from_value("5000")
+    assert sorted(generated(controller)) == [
+        ("2025-01-06", "Academia", academia), ("2025-01-20", "Academia", academia),
+        ("2025-02-03", "Academia", academia), ("2025-02-05", "Salário", salario),
+        ("2025-02-17", "Academia", academia), ("2025-03-03", "Academia", academia),
+        ("2025-03-17", "Academia", academia), ("2025-03-31", "Academia", academia),
+    ]
+    assert [rule.next_date for rule in controller.get_recurring_rules()] == ["2025-04-14", None]
+    assert controller.verify_totals() == []
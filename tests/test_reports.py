@@ -0,0 +1,36 @@
+import numpy as np
+
+from models import Money
+from reports import _aggregate_chunk, compute_report, report_totals
+
+
+def chunk(dates, amounts, types):
+    return {"date": np.array(dates, dtype="datetime64[D]"), "amount": np.array(amounts, dtype=np.int64),
+            "type": np.array(types, dtype=np.int8)}
+
+
+def test_chunk_sums_are_exact_integers():
+    # 2**53 + 1 não cabe em um float64
+    data = chunk(["2025-01-01", "2025-01-01", "2025-01-03"], [2 ** 53, 1, 5], [0, 0, 1])
+
+    keys, income, expenses, counts = _aggregate_chunk(data["date"].view(np.int64), data["amount"], data["type"])
+
+    assert income.dtype == expenses.dtype == np.int64
+    assert income.tolist() == [2 ** 53 + 1, 0]
+    assert expenses.tolist() == [0, 5]
+    assert counts.tolist() == [2, 1]
+
+
+def test_report_across_chunks_and_rollup():
+    chunks = [chunk(["2025-01-05", "2025-03-02"], [10010, 2005], [0, 1]),
+              chunk(["2025-03-31"], [1], [1])]
+    monthly = {"month": np.array(["2025-01"], dtype="datetime64[M]"), "Receita": np.array([990], dtype=np.int64),
+               "Despesa": np.array([0], dtype=np.int64), "count": np.array([2], dtype=np.int64)}
+
+    report = compute_report(chunks, "month", Money(-100), monthly)
+
+    assert report["Receita"].tolist() == [110.0, 0.0, 0.0]
+    assert report["Despesa"].tolist() == [0.0, 0.0, 20.06]
+    assert report["balance"].tolist() == [109.0, 109.0, 88.94]
+    assert report["count"].tolist() == [3, 0, 2]
+    assert report_totals(report) == {"Receita": Money(11000), "Despesa": Money(2006)}
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+import controllers
+from models import Money
+
+
+def stored_months(controller):
+    return [month for month, in controller.conn.execute("SELECT DISTINCT month FROM monthly_rollup ORDER BY month")]
+
+
+@pytest.fixture
+def ledger(controller):
+    controller.add_transaction("2024-01-10", "Salário", "1000", "Receita")
+    controller.add_transaction("2024-01-20", "Mercado", "250.50", "Despesa")
+    controller.add_transaction("2024-02-05", "Aluguel", "800", "Despesa")
+    return controller
+
+
+def test_summary_does_not_wait_for_writer(ledger):
+    started, release = threading.Event(), threading.Event()
+
+    def save():
+        # Uma gravação da interface segurando o lock de escrita
+        with ledger.db.transaction():
+            started.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=save)
+    writer.start()
+    started.wait(5)
+    try:
+        summary = ledger.summarize_transactions()
+        assert stored_months(ledger) == []
+    finally:
+        release.set()
+        writer.join()
+
+    assert summary == {"Receita": (Money.from_value("1000"), 1), "Despesa": (Money.from_value("1050.50"), 2)}
+    assert ledger.summarize_transactions() == summary
+    assert stored_months(ledger) == ["2024-01", "2024-02"]
+
+
+def test_stale_rollup_is_not_stored(ledger, monkeypatch):
+    original = controllers.compute_rollup
+
+    def compute_then_write(*args):
+        rows = original(*args)
+        monkeypatch.setattr(controllers, "compute_rollup", original)
+        ledger.add_transaction("2024-01-25", "Farmácia", "49.50", "Despesa")
+        return rows
+
+    monkeypatch.setattr(controllers, "compute_rollup", compute_then_write)
+    ledger.summarize_transactions()
+
+    assert stored_months(ledger) == []
+    assert ledger.summarize_transactions() == {"Receita": (Money.from_value("1000"), 1),
+                                               "Despesa": (Money.from_value("1100"), 3)}
+    assert stored_months(ledger) == ["2024-01", "2024-02"]
@@ -0,0 +1,42 @@
+import pytest
+
+from controllers import FinancialController
+from database import fts5_available
+
+ROWS = 20000
+
+
+@pytest.fixture(scope="module")
+def controller(tmp_path_factory):
+    controller = FinancialController(str(tmp_path_factory.mktemp("search") / "finance.db"))
+    if not fts5_available(controller.conn):
+        controller.close()
+        pytest.skip("SQLite sem FTS5")
+    inserted, rejects = controller.import_transactions(
+        (("2025-01-01", f"desc {number}", "1", "Despesa") for number in range(ROWS)))
+    assert (inserted, rejects) == (ROWS, [])
+    yield controller
+    controller.close()
+
+
+def test_exact_match_among_old_rows(controller):
+    # "desc 1" é uma das primeiras transações e o prefixo "1" aparece em
+    # mais de 10 mil descrições posteriores
+    descriptions = [t.description for t in controller.search("desc 1", 50)]
+    assert "desc 1" in descriptions
+
+
+def test_paging_reaches_every_match(controller):
+    ids = set()
+    offset = 0
+    while True:
+        page = controller.search("desc", 5000, offset)
+        if not page:
+            break
+        ids.update(t.id for t in page)
+        offset += len(page)
+    assert len(ids) == ROWS
+
+
+def test_offset_past_first_pages(controller):
+    assert len(controller.search("desc", 10, offset=ROWS - 10)) == 10
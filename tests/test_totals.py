@@ -0,0 +1,41 @@
+from models import Money
+
+
+def assert_totals(controller, income, expenses):
+    assert controller.verify_totals() == []
+    assert controller.get_total_income() == Money.from_value(income)
+    assert controller.get_total_expenses() == Money.from_value(expenses)
+    assert controller.get_balance() == Money.from_value(income) - Money.from_value(expenses)
+
+
+def test_totals_follow_edits_and_deletes(controller):
+    salary = controller.add_transaction("2025-01-05", "Salário", "5000", "Receita")
+    rent = controller.add_transaction("2025-01-10", "Aluguel", "1500", "Despesa")
+    market = controller.add_transaction("2025-01-10", "Mercado", "320.45", "Despesa")
+    assert_totals(controller, "5000", "1820.45")
+
+    # Valor, tipo e data alterados: sai de um total diário e entra em outro
+    controller.update_transaction(market, "2025-02-01", "Reembolso", "20.45", "Receita")
+    assert_totals(controller, "5020.45", "1500")
+
+    controller.delete_transaction(rent)
+    assert_totals(controller, "5020.45", "0")
+
+
+def test_totals_follow_bulk_changes(controller):
+    ids = [controller.add_transaction("2025-03-%02d" % day, f"Compra {day}", "10.10", "Despesa")
+           for day in range(1, 11)]
+    controller.add_transaction("2025-03-01", "Salário", "3000", "Receita")
+
+    assert controller.update_transactions(ids[:4], amount="20", date="2025-03-15") == 4
+    assert_totals(controller, "3000", "140.60")
+
+    assert controller.update_transactions(ids[4:6], type="Receita") == 2
+    assert_totals(controller, "3020.20", "120.40")
+
+    assert controller.delete_transactions(ids[::2]) == 5
+    assert_totals(controller, "3010.10", "60.20")
+
+    dates, balances = controller.get_daily_balance()
+    assert str(dates[-1]) == "2025-03-15"
+    assert balances[-1] == controller.get_balance()
@@ -0,0 +1,68 @@
+import threading
+import time
+
+from workers import BackgroundWorker
+
+
+class Widget:
+    """Substitui o widget Tk: guarda o ``after`` em vez de agendá-lo."""
+
+    def after(self, delay, func):
+        return "poll"
+
+    def after_cancel(self, poll_id):
+        pass
+
+
+def wait_results(worker, count):
+    deadline = time.monotonic() + 5
+    while worker._results.qsize() < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_cancel_discards_running_job_and_forgets_key():
+    worker = BackgroundWorker(Widget(), lambda: None)
+    started, release = threading.Event(), threading.Event()
+    delivered = []
+
+    def slow(controller):
+        started.set()
+        release.wait(5)
+        return "antigo"
+
+    try:
+        worker.submit("resumo", slow, delivered.append)
+        started.wait(5)
+        worker.cancel("resumo")
+        assert worker._generations == {}
+        worker.submit("resumo", lambda controller: "novo", delivered.append)
+        release.set()
+        wait_results(worker, 2)
+        worker._poll()
+    finally:
+        worker.shutdown()
+
+    assert delivered == ["novo"]
+    assert worker._generations == {}
+
+
+def test_cancel_without_pending_job_keeps_nothing():
+    worker = BackgroundWorker(Widget(), lambda: None)
+    try:
+        for number in range(100):
+            worker.cancel(("pagina", number))
+        assert worker._generations == {}
+    finally:
+        worker.shutdown()
+
+
+def test_synchronous_worker_runs_in_calling_thread():
+    threads = []
+    worker = BackgroundWorker(Widget(), lambda: None, synchronous=True)
+    worker.submit("resumo", lambda controller: threads.append(threading.current_thread()) or 1, threads.append)
+    worker.submit(None, lambda controller: 1 / 0, error_callback=threads.append)
+
+    assert threads == [threading.current_thread()]
+    worker._poll()
+    assert threads[1] == 1 and isinstance(threads[2], ZeroDivisionError)
+    assert worker._generations == {}
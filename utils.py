@@ -1,27 +1,84 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from models import TRANSACTION_TYPES, Money
 
-def generate_report(transactions):
+def generate_report(transactions, period="month", **filters):
     """Gera um relatório financeiro com base nas transações.
 
+    Os cálculos ficam a cargo de ``reports.compute_report``; esta função
+    apenas exibe o resumo e os gráficos.
+
     Args:
-        transactions (list): Lista de transações.
+        transactions: Lista de ``Transaction`` ou um ``FinancialController``; com
+            o controlador, os meses fechados vêm dos agregados mensais.
+        period (str): Período de agrupamento (day, week, month ou year).
+        **filters: Filtros repassados a ``FinancialController.generate_report``.
+
+    Returns:
+        pd.DataFrame: O relatório calculado.
     """
-    df = pd.DataFrame(transactions, columns=["ID", "Date", "Description", "Amount", "Type"])
-    df['Date'] = pd.to_datetime(df['Date'])
-    df.set_index('Date', inplace=True)
+    # Importados aqui para que importar utils não carregue o matplotlib
+    import numpy as np
+    import matplotlib.pyplot as plt
+    from charts import downsample
+    from reports import compute_report, report_totals
+
+    if hasattr(transactions, "generate_report"):
+        report = transactions.generate_report(period, **filters)
+    else:
+        chunk = {
+            "date": np.array([t.date for t in transactions], dtype="datetime64[D]"),
+            "amount": np.array([Money.from_value(t.amount) for t in transactions], dtype=np.int64),
+            "type": np.array([TRANSACTION_TYPES.index(t.type) for t in transactions], dtype=np.int8),
+        }
+        report = compute_report([chunk], period)
+    totals = report_totals(report)
 
     # Relatório de resumo
-    summary = df.groupby('Type')['Amount'].sum()
     print("Resumo Financeiro:")
-    print(summary)
+    for type, total in totals.items():
+        print(f"{type}: {total:.2f}")
 
-    # Gráfico de evolução ao longo do tempo
-    df.resample('M')['Amount'].sum().plot(kind='line', title="Evolução Financeira Mensal")
-    plt.xlabel("Data")
-    plt.ylabel("Valor")
+    # Evolução e distribuição na mesma figura, exibida uma única vez
+    fig, (ax_evolucao, ax_distribuicao) = plt.subplots(1, 2, figsize=(12, 5))
+    width = int(ax_evolucao.get_window_extent().width)
+    dates = report.index.to_numpy()
+    for column in ("net", "balance"):
+        ax_evolucao.plot(*downsample(dates, report[column].to_numpy(), width), label=column)
+    ax_evolucao.set_title("Evolução Financeira")
+    ax_evolucao.set_xlabel("Data")
+    ax_evolucao.set_ylabel("Valor")
+    ax_evolucao.legend()
+
+    ax_distribuicao.pie(list(totals.values()), labels=list(totals), autopct='%1.1f%%')
+    ax_distribuicao.set_title("Distribuição de Receitas e Despesas")
+    fig.tight_layout()
     plt.show()
+    return report
+
+def plot_breakdown(controller, by="category", type="Despesa", limit=10, **filters):
+    """Exibe um gráfico de barras com os totais por categoria (ou conta).
+
+    Os totais são agrupados pelo próprio SQLite (ver
+    ``FinancialController.summarize_by_category``); só uma linha por grupo
+    chega ao Python, sem DataFrame das transações.
 
-    # Gráfico de pizza de receitas vs despesas
-    df.groupby('Type')['Amount'].sum().plot(kind='pie', autopct='%1.1f%%', title="Distribuição de Receitas e Despesas")
-    plt.show()
\ No newline at end of file
+    Args:
+        controller (FinancialController): Controlador com as transações.
+        by (str): "category" ou "account".
+        type (str): Tipo de transação exibido (Receita/Despesa).
+        limit (int): Quantidade de barras; os grupos restantes são somados
+            em "Outras".
+        **filters: Filtros de período e valores repassados ao controlador.
+
+    Returns:
+        list: Pares (nome, total) exibidos, do maior para o menor.
+    """
+    # Importados aqui para que importar utils não carregue o matplotlib
+    import matplotlib.pyplot as plt
+    from charts import breakdown_data, draw_breakdown
+
+    bars = breakdown_data(controller, by, type, limit, **filters)
+    fig, ax = plt.subplots()
+    draw_breakdown(ax, bars, f"{type} por {'categoria' if by == 'category' else 'conta'}")
+    fig.tight_layout()
+    plt.show()
+    return bars
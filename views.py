@@ -1,19 +1,129 @@
 import customtkinter as ctk
 from tkinter import ttk
-import pandas as pd
 from tkcalendar import DateEntry
 from controllers import FinancialController
+from charts import CHARTS
+from workers import BackgroundWorker
+from instrumentation import timed
 from tkinter import messagebox
 from datetime import datetime
+from models import DATE_FORMAT, Money
 
 # Configuração da janela principal
 ctk.set_appearance_mode("light")  # Tema claro
 ctk.set_default_color_theme("blue")
 
+def formatar_data(data):
+    """Converte uma data gravada como AAAA-MM-DD para exibição em DD/MM/AAAA."""
+    return datetime.strptime(data, DATE_FORMAT).strftime("%d/%m/%Y")
+
+class PainelGraficos(ctk.CTkFrame):
+    """Painel com os gráficos de ``charts.CHARTS`` embutidos no dashboard.
+
+    Os dados de cada gráfico são calculados pelo worker, fora da thread do
+    Tk, e desenhados em uma figura do matplotlib exibida por
+    ``FigureCanvasTkAgg``. Cada figura desenhada é guardada com a
+    ``data_version`` do controlador e a largura usada, e só é recalculada
+    quando as transações mudam ou o painel fica mais largo.
+    """
+
+    # Largura usada enquanto o painel ainda não foi exibido, em pixels
+    LARGURA_PADRAO = 760
+
+    def __init__(self, master, controller, worker):
+        super().__init__(master)
+        self.controller = controller
+        self.worker = worker
+        self._graficos = {}  # nome -> (versão dos dados, largura, canvas)
+        self._exibido = None
+
+        self.seletor = ctk.CTkSegmentedButton(self, values=list(CHARTS), command=lambda nome: self.mostrar())
+        self.seletor.set(next(iter(CHARTS)))
+        self.seletor.pack(fill='x', padx=5, pady=5)
+
+        self.area = ctk.CTkFrame(self)
+        self.area.pack(fill='both', expand=True)
+
+    def mostrar(self):
+        """Exibe o gráfico selecionado, recalculando-o só se os dados mudaram."""
+        nome = self.seletor.get()
+        versao = self.controller.data_version
+        largura = self.area.winfo_width()
+        if largura <= 1:
+            largura = self.LARGURA_PADRAO
+        guardado = self._graficos.get(nome)
+        if guardado is not None and guardado[0] == versao and largura <= guardado[1]:
+            self._exibir(guardado[2])
+            return
+        calcular, _ = CHARTS[nome]
+        self.worker.submit(
+            ("grafico", nome),
+            lambda controller: calcular(controller, largura),
+            callback=lambda dados: self._desenhar(nome, versao, largura, dados),
+            error_callback=lambda erro: print(f"Erro ao calcular o gráfico {nome}: {erro}"))
+
+    @timed()
+    def _desenhar(self, nome, versao, largura, dados):
+        """Desenha na figura do gráfico os dados recebidos do worker."""
+        guardado = self._graficos.get(nome)
+        if guardado is None:
+            # Importados só quando o primeiro gráfico é desenhado
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            figura = Figure(figsize=(largura / 100, 4), dpi=100, layout="constrained")
+            canvas = FigureCanvasTkAgg(figura, master=self.area)
+        else:
+            canvas = guardado[2]
+            figura = canvas.figure
+            figura.clear()
+        _, desenhar = CHARTS[nome]
+        desenhar(figura.add_subplot(), dados)
+        canvas.draw_idle()
+        self._graficos[nome] = (versao, largura, canvas)
+        if nome == self.seletor.get():
+            self._exibir(canvas)
+
+    def _exibir(self, canvas):
+        """Troca o gráfico visível pelo do canvas informado."""
+        if self._exibido is canvas:
+            return
+        if self._exibido is not None:
+            self._exibido.get_tk_widget().pack_forget()
+        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._exibido = canvas
+
 class FinanceDashboard(ctk.CTk):
+    # Linhas buscadas por página e páginas mantidas na tabela ao mesmo tempo
+    PAGE_SIZE = 200
+    MAX_PAGINAS = 3
+
+    # Espera após a última tecla antes de buscar, em ms
+    BUSCA_ATRASO_MS = 300
+
+    # Colunas da tabela que podem ser ordenadas (todas com índice no banco)
+    COLUNAS_ORDENAVEIS = {"Tipo": "type", "Data": "date", "Valor": "amount", "ID": "id"}
+
     def __init__(self, controller):
         super().__init__()
         self.controller = controller
+        self._filtros = {}
+        self._ordem = ("id", False)
+        self._chaves = {}
+        self._inicio_alcancado = True
+        self._fim_alcancado = True
+        self._carregando = False
+        self._resumo = {"Receita": Money(0), "Despesa": Money(0)}
+        self._resumo_pendente = False
+        self._alterados_durante_carga = set()
+        self._busca = ""
+        self._busca_agendada = None
+        self._graficos_visiveis = False
+        
+        # Consultas rodam em segundo plano; o controlador dá a cada thread
+        # sua própria conexão de leitura, exceto em bancos em memória, que
+        # têm uma só conexão e por isso executam as consultas nesta thread
+        self.worker = BackgroundWorker(self, lambda: controller, synchronous=controller.db.shared)
+        self.protocol("WM_DELETE_WINDOW", self._fechar)
         self.title("Dashboard Financeiro")
         self.geometry("800x500")
         
@@ -48,19 +158,31 @@ class FinanceDashboard(ctk.CTk):
         self.btn_limpar_filtro = ctk.CTkButton(self.frame_filtros, text="Limpar Filtro", command=self.limpar_filtro)
         self.btn_limpar_filtro.pack(side='left', padx=5)
         
+        # Busca pela descrição enquanto o usuário digita
+        self.lbl_busca = ctk.CTkLabel(self.frame_filtros, text="Buscar:")
+        self.lbl_busca.pack(side='left', padx=5)
+        
+        self.entry_busca = ctk.CTkEntry(self.frame_filtros, placeholder_text="Descrição")
+        self.entry_busca.pack(side='left', padx=5, fill='x', expand=True)
+        self.entry_busca.bind("<KeyRelease>", self._ao_digitar_busca)
+        
         # Frame principal - Tabela de transações
         self.frame_tabela = ctk.CTkFrame(self)
         self.frame_tabela.pack(fill='both', expand=True, padx=10, pady=5)
         
         # Definindo as colunas na ordem desejada: Tipo, Data, Descrição, Valor, ID
         self.tree = ttk.Treeview(self.frame_tabela, columns=("Tipo", "Data", "Descrição", "Valor", "ID"), show='headings')
-        self.tree.heading("Tipo", text="Tipo")
-        self.tree.heading("Data", text="Data")
-        self.tree.heading("Descrição", text="Descrição")
-        self.tree.heading("Valor", text="Valor")
-        self.tree.heading("ID", text="ID")
-        
-        self.tree.pack(fill='both', expand=True)
+        for coluna in ("Tipo", "Data", "Descrição", "Valor", "ID"):
+            if coluna in self.COLUNAS_ORDENAVEIS:
+                self.tree.heading(coluna, text=coluna, command=lambda c=coluna: self.ordenar_por(c))
+            else:
+                self.tree.heading(coluna, text=coluna)
+        
+        # A tabela mantém só uma janela de páginas; a rolagem busca as demais
+        self.scrollbar = ttk.Scrollbar(self.frame_tabela, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._ao_rolar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
         
         # Frame inferior - Botões de ação
         self.frame_botoes = ctk.CTkFrame(self)
@@ -75,65 +197,336 @@ class FinanceDashboard(ctk.CTk):
         self.btn_remover = ctk.CTkButton(self.frame_botoes, text="Remover", command=self.remover_transacao)
         self.btn_remover.pack(side='left', padx=5)
         
+        # Gráficos, exibidos no lugar da tabela
+        self.painel_graficos = PainelGraficos(self, controller, self.worker)
+        self.btn_graficos = ctk.CTkButton(self.frame_botoes, text="Gráficos", command=self.alternar_graficos)
+        self.btn_graficos.pack(side='right', padx=5)
+        
         # Atualiza a tabela e o resumo financeiro ao iniciar
         self.update_transactions_list()
         self.update_resumo()
-
-    def update_transactions_list(self, transactions=None):
-        """Atualiza a lista de transações na tabela."""
-        for row in self.tree.get_children():
-            self.tree.delete(row)
         
-        # Se nenhuma lista de transações for passada, busca todas as transações
-        if transactions is None:
-            transactions = self.controller.get_transactions()
-        
-        for transaction in transactions:
-            # Inserindo os valores na ordem correta: Tipo, Data, Descrição, Valor, ID
-            self.tree.insert("", "end", values=(transaction[4], transaction[1], transaction[2], f"R$ {transaction[3]:.2f}", transaction[0]))
+        # Cada alteração feita pelo controlador é aplicada só à linha afetada
+        self.controller.subscribe(self._ao_alterar_transacao)
+
+    def _fechar(self):
+        """Encerra o processamento em segundo plano e fecha a janela."""
+        self.worker.shutdown()
+        self.controller.close()
+        self.destroy()
 
-    def update_resumo(self, transactions=None):
-        """Atualiza o resumo financeiro (saldo, receitas e despesas)."""
-        if transactions is None:
-            df = self.controller.get_transactions_dataframe()
+    def alternar_graficos(self):
+        """Alterna entre a tabela de transações e o painel de gráficos."""
+        if self._graficos_visiveis:
+            self.painel_graficos.pack_forget()
+            self.frame_tabela.pack(fill='both', expand=True, padx=10, pady=5, before=self.frame_botoes)
+            self.btn_graficos.configure(text="Gráficos")
         else:
-            df = pd.DataFrame(transactions, columns=["id", "date", "description", "amount", "type"])
-        
-        if not df.empty:
-            receitas = df[df['type'] == 'Receita']['amount'].sum()
-            despesas = df[df['type'] == 'Despesa']['amount'].sum()
-            saldo = receitas - despesas
-            
-            # Atualiza os labels na ordem desejada: Saldo, Receitas, Despesas
-            self.lbl_saldo.configure(text=f"Saldo: R$ {saldo:.2f}")
-            self.lbl_receitas.configure(text=f"Receitas: R$ {receitas:.2f}")
-            self.lbl_despesas.configure(text=f"Despesas: R$ {despesas:.2f}")
+            self.frame_tabela.pack_forget()
+            self.painel_graficos.pack(fill='both', expand=True, padx=10, pady=5, before=self.frame_botoes)
+            self.btn_graficos.configure(text="Tabela")
+            self.painel_graficos.mostrar()
+        self._graficos_visiveis = not self._graficos_visiveis
+
+    @timed()
+    def update_transactions_list(self):
+        """Recarrega a tabela a partir da primeira página dos filtros atuais."""
+        self.tree.delete(*self.tree.get_children())
+        self._chaves = {}
+        self._inicio_alcancado = True
+        self._fim_alcancado = False
+        self._carregando = True
+        self._carregar_pagina(para_frente=True)
+
+    def ordenar_por(self, coluna):
+        """Ordena a tabela pela coluna clicada, invertendo a ordem no segundo clique."""
+        campo = self.COLUNAS_ORDENAVEIS[coluna]
+        campo_atual, decrescente = self._ordem
+        self._ordem = (campo, not decrescente if campo == campo_atual else False)
+        self.update_transactions_list()
+
+    def _ao_digitar_busca(self, event=None):
+        """Agenda a busca para depois que o usuário parar de digitar."""
+        if self._busca_agendada is not None:
+            self.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.after(self.BUSCA_ATRASO_MS, self._aplicar_busca)
+
+    def _aplicar_busca(self):
+        """Recarrega a tabela com os resultados do texto buscado (ou sem busca, se vazio)."""
+        self._busca_agendada = None
+        texto = self.entry_busca.get().strip()
+        if texto == self._busca:
+            return
+        self._busca = texto
+        self.update_transactions_list()
+
+    @staticmethod
+    def _valores_item(transaction):
+        """Valores exibidos de uma transação, na ordem: Tipo, Data, Descrição, Valor, ID."""
+        return (transaction.type, formatar_data(transaction.date), transaction.description,
+                f"R$ {transaction.amount:.2f}", transaction.id)
+
+    def _inserir_item(self, transaction, posicao, chave=None):
+        """Insere uma transação na tabela, identificada pelo seu ID.
+
+        Args:
+            transaction (Transaction): Transação a ser exibida.
+            posicao: Índice na tabela (ou "end").
+            chave (optional): Chave de paginação da linha; por padrão, a da
+                ordenação atual. Na busca, é a posição no ranking.
+        """
+        iid = str(transaction.id)
+        self.tree.insert("", posicao, iid=iid, values=self._valores_item(transaction))
+        if chave is None:
+            chave = (getattr(transaction, self._ordem[0]), transaction.id)
+        self._chaves[iid] = chave
+
+    def _carregar_pagina(self, para_frente, ancora=None):
+        """Pede ao worker a página seguinte (ou anterior) à janela exibida.
+
+        Args:
+            para_frente (bool): True para a página seguinte, False para a anterior.
+            ancora (str, optional): Item que deve continuar no topo da área
+                visível depois que a página for exibida.
+        """
+        itens = self.tree.get_children()
+        filtros = dict(self._filtros)
+        self._alterados_durante_carga = set()
+        if self._busca:
+            self._carregar_busca(itens, para_frente, ancora, filtros)
+            return
+        if para_frente:
+            after = self._chaves[itens[-1]] if itens else None
+        else:
+            after = self._chaves[itens[0]]
+        campo, decrescente = self._ordem
+        self.worker.submit(
+            "pagina",
+            lambda controller: controller.get_transactions_page(
+                order_by=campo, descending=decrescente if para_frente else not decrescente,
+                after=after, limit=self.PAGE_SIZE, **filtros),
+            callback=lambda transactions: self._exibir_pagina(transactions, para_frente, ancora),
+            error_callback=self._erro_pagina)
+
+    def _carregar_busca(self, itens, para_frente, ancora, filtros):
+        """Pede ao worker uma página dos resultados da busca.
+
+        Os resultados vêm ordenados por relevância, então a paginação é por
+        posição no ranking, guardada como chave de cada linha.
+        """
+        texto = self._busca
+        if para_frente:
+            offset = self._chaves[itens[-1]] + 1 if itens else 0
+            limit = self.PAGE_SIZE
+        else:
+            primeiro = self._chaves[itens[0]]
+            offset = max(0, primeiro - self.PAGE_SIZE)
+            limit = primeiro - offset
+        self.worker.submit(
+            "pagina",
+            lambda controller: controller.search(texto, limit, offset, **filtros),
+            callback=lambda transactions: self._exibir_pagina(
+                transactions if para_frente else transactions[::-1], para_frente, ancora,
+                posicoes=range(offset, offset + len(transactions)) if para_frente
+                else range(offset + len(transactions) - 1, offset - 1, -1)),
+            error_callback=self._erro_pagina)
+
+    @timed()
+    def _exibir_pagina(self, transactions, para_frente, ancora, posicoes=None):
+        """Insere na tabela uma página recebida do worker.
+
+        Args:
+            transactions (list): Transações na ordem em que serão inseridas.
+            para_frente (bool): True se a página segue a janela exibida.
+            ancora (str, optional): Item a manter no topo da área visível.
+            posicoes (iterable, optional): Posição no ranking de cada
+                transação, nas páginas de busca.
+        """
+        completa = len(transactions) == self.PAGE_SIZE
+        if posicoes is None:
+            posicoes = [None] * len(transactions)
+        # Linhas alteradas enquanto a página era buscada já foram tratadas pelo evento
+        pares = [(t, posicao) for t, posicao in zip(transactions, posicoes)
+                 if str(t.id) not in self._alterados_durante_carga and not self.tree.exists(str(t.id))]
+        if para_frente:
+            self._fim_alcancado = not completa
+            for transaction, posicao in pares:
+                self._inserir_item(transaction, "end", posicao)
+        else:
+            # A página anterior vem em ordem inversa; cada linha vai para o topo
+            self._inicio_alcancado = not completa
+            for transaction, posicao in pares:
+                self._inserir_item(transaction, 0, posicao)
+        self._aparar_janela(para_frente)
+        if ancora is None:
+            self.tree.yview_moveto(0)
+        elif self.tree.exists(ancora):
+            # Mantém no topo a mesma linha que estava visível antes de carregar
+            self.tree.yview_moveto(self.tree.index(ancora) / len(self.tree.get_children()))
+        self._carregando = False
+
+    def _erro_pagina(self, erro):
+        """Libera novas cargas de página depois de uma falha na consulta."""
+        self._carregando = False
+        print(f"Erro ao carregar transações: {erro}")
+
+    @timed()
+    def _aparar_janela(self, para_frente):
+        """Remove as linhas do lado oposto ao carregado além do limite da janela."""
+        itens = self.tree.get_children()
+        excesso = len(itens) - self.PAGE_SIZE * self.MAX_PAGINAS
+        if excesso <= 0:
+            return
+        if para_frente:
+            removidos = itens[:excesso]
+            self._inicio_alcancado = False
+        else:
+            removidos = itens[-excesso:]
+            self._fim_alcancado = False
+        self.tree.delete(*removidos)
+        for iid in removidos:
+            del self._chaves[iid]
+
+    def _ao_rolar(self, primeiro, ultimo):
+        """Atualiza a barra de rolagem e carrega páginas perto das bordas da janela."""
+        self.scrollbar.set(primeiro, ultimo)
+        if self._carregando:
+            return
+        primeiro, ultimo = float(primeiro), float(ultimo)
+        if ultimo > 0.9 and not self._fim_alcancado:
+            para_frente = True
+        elif primeiro < 0.1 and not self._inicio_alcancado:
+            para_frente = False
+        else:
+            return
+        self._carregando = True
+        itens = self.tree.get_children()
+        ancora = itens[min(int(primeiro * len(itens)), len(itens) - 1)] if itens else None
+        self._carregar_pagina(para_frente, ancora)
+
+    def update_resumo(self, summary=None):
+        """Atualiza o resumo financeiro (saldo, receitas e despesas).
+
+        Args:
+            summary (dict, optional): Mapeamento tipo -> (soma, quantidade) já
+                calculado. Se omitido, o resumo dos filtros atuais (ou os
+                totais gerais, sem filtros) é calculado em segundo plano.
+        """
+        if summary is None:
+            filtros = dict(self._filtros)
+            self._resumo_pendente = True
+            self.worker.submit(
+                "resumo",
+                lambda controller: controller.summarize_transactions(**filtros) if filtros else {
+                    "Receita": (controller.get_total_income(), None),
+                    "Despesa": (controller.get_total_expenses(), None)},
+                callback=self.update_resumo)
+            return
+        self._resumo_pendente = False
+        receitas = summary.get('Receita', (Money(0), 0))[0]
+        despesas = summary.get('Despesa', (Money(0), 0))[0]
+        self._resumo = {"Receita": receitas, "Despesa": despesas}
+        self._exibir_resumo()
+
+    @timed()
+    def _exibir_resumo(self):
+        """Exibe nos labels os totais guardados em ``self._resumo``."""
+        receitas = self._resumo["Receita"]
+        despesas = self._resumo["Despesa"]
+        saldo = receitas - despesas
+        
+        # Atualiza os labels na ordem desejada: Saldo, Receitas, Despesas
+        self.lbl_saldo.configure(text=f"Saldo: R$ {saldo:.2f}")
+        self.lbl_receitas.configure(text=f"Receitas: R$ {receitas:.2f}")
+        self.lbl_despesas.configure(text=f"Despesas: R$ {despesas:.2f}")
+
+    def _corresponde_filtro(self, transaction):
+        """Indica se a transação atende aos filtros aplicados à tabela."""
+        filtros = self._filtros
+        date, description, amount, type = transaction.date, transaction.description, transaction.amount, transaction.type
+        if filtros.get("start_date") is not None and date < filtros["start_date"]:
+            return False
+        if filtros.get("end_date") is not None and date > filtros["end_date"]:
+            return False
+        if filtros.get("type") is not None and type != filtros["type"]:
+            return False
+        if filtros.get("description") and filtros["description"].lower() not in description.lower():
+            return False
+        if filtros.get("min_amount") is not None and amount < Money.from_value(filtros["min_amount"]):
+            return False
+        if filtros.get("max_amount") is not None and amount > Money.from_value(filtros["max_amount"]):
+            return False
+        return True
+
+    def _posicionar_item(self, transaction):
+        """Insere a transação na posição da ordenação atual, se cair na janela exibida."""
+        campo, decrescente = self._ordem
+        chave = (getattr(transaction, campo), transaction.id)
+        itens = self.tree.get_children()
+        posicao = len(itens)
+        for indice, iid in enumerate(itens):
+            if (self._chaves[iid] > chave) != decrescente:
+                posicao = indice
+                break
+        # Fora da janela: a linha aparecerá quando a página dela for carregada
+        if posicao == 0 and itens and not self._inicio_alcancado:
+            return
+        if posicao == len(itens) and not self._fim_alcancado:
+            return
+        self._inserir_item(transaction, posicao)
+
+    @timed()
+    def _ao_alterar_transacao(self, action, old, new):
+        """Aplica à tabela e ao resumo apenas a transação alterada."""
+        if self._graficos_visiveis:
+            # Oculto, o painel recalcula ao ser exibido de novo
+            self.painel_graficos.mostrar()
+        if action == "reload":
+            self.update_transactions_list()
+            self.update_resumo()
+            return
+        if self._carregando and old is not None:
+            self._alterados_durante_carga.add(str(old.id))
+        if old is not None:
+            iid = str(old.id)
+            if self._busca and new is not None and self.tree.exists(iid) and self._corresponde_filtro(new):
+                # Na busca a posição vem do ranking do índice: a linha é atualizada no lugar
+                self.tree.item(iid, values=self._valores_item(new))
+            elif self.tree.exists(iid):
+                self.tree.delete(iid)
+                del self._chaves[iid]
+            if self._corresponde_filtro(old):
+                self._resumo[old.type] -= old.amount
+        if new is not None and self._corresponde_filtro(new):
+            self._resumo[new.type] += new.amount
+            # Transações novas só entram nos resultados de uma nova busca
+            if not self._busca:
+                self._posicionar_item(new)
+        if self._resumo_pendente:
+            # O resumo em cálculo pode não incluir esta alteração; recalcula
+            self.update_resumo()
         else:
-            self.lbl_saldo.configure(text="Saldo: R$ 0,00")
-            self.lbl_receitas.configure(text="Receitas: R$ 0,00")
-            self.lbl_despesas.configure(text="Despesas: R$ 0,00")
+            self._exibir_resumo()
 
     def filtrar_transacoes(self):
         """Filtra as transações por data."""
         data_filtro = self.entry_data.get()
         try:
             # Converte a data do filtro para o formato YYYY-MM-DD
-            data_filtro_formatada = datetime.strptime(data_filtro, "%d/%m/%Y").strftime("%Y-%m-%d")
-            
-            # Recupera todas as transações
-            transactions = self.controller.get_transactions()
+            data_filtro_formatada = datetime.strptime(data_filtro, "%d/%m/%Y").strftime(DATE_FORMAT)
             
-            # Filtra as transações pela data selecionada
-            transacoes_filtradas = [t for t in transactions if t[1] == data_filtro_formatada]
+            # Filtra e totaliza as transações no próprio banco de dados
+            self._filtros = {"start_date": data_filtro_formatada, "end_date": data_filtro_formatada}
             
             # Atualiza a tabela e o resumo com as transações filtradas
-            self.update_transactions_list(transacoes_filtradas)
-            self.update_resumo(transacoes_filtradas)
+            self.update_transactions_list()
+            self.update_resumo()
         except ValueError:
             messagebox.showerror("Erro", "Data inválida! Use o formato DD/MM/AAAA.")
 
     def limpar_filtro(self):
         """Limpa o filtro e exibe todas as transações."""
+        self._filtros = {}
         self.update_transactions_list()
         self.update_resumo()
 
@@ -175,14 +568,14 @@ class FinanceDashboard(ctk.CTk):
     def salvar_transacao(self, date, description, amount, type, window):
         """Salva a nova transação."""
         try:
-            amount = float(amount)
+            amount = Money.from_value(amount)
         except ValueError:
             messagebox.showerror("Erro", "Digite um valor válido!")
             return
         
-        self.controller.add_transaction(date, description, amount, type)
-        self.update_transactions_list()
-        self.update_resumo()
+        if self.controller.add_transaction(date, description, amount, type) is None:
+            messagebox.showerror("Erro", "Não foi possível adicionar a transação!")
+            return
         window.destroy()
 
     def editar_transacao(self):
@@ -193,11 +586,10 @@ class FinanceDashboard(ctk.CTk):
             return
         
         # Obtém o ID da transação selecionada diretamente da tabela
-        transaction_id = self.tree.item(selected_item, "values")[4]  # ID está na última coluna
+        transaction_id = self.tree.item(selected_item[0], "values")[4]  # ID está na última coluna
         
         # Recupera a transação correspondente ao ID
-        transactions = self.controller.get_transactions()
-        transaction = next((t for t in transactions if t[0] == int(transaction_id)), None)
+        transaction = self.controller.get_transaction(int(transaction_id))
         
         if not transaction:
             messagebox.showerror("Erro", "Transação não encontrada!")
@@ -211,20 +603,20 @@ class FinanceDashboard(ctk.CTk):
         # Preenche os campos com os dados atuais
         ctk.CTkLabel(edit_window, text="Data:").grid(row=0, column=0, padx=5, pady=5)
         date_entry = DateEntry(edit_window, date_pattern='dd/mm/yyyy')
-        date_entry.set_date(transaction[1])
+        date_entry.set_date(datetime.strptime(transaction.date, DATE_FORMAT).date())
         date_entry.grid(row=0, column=1, padx=5, pady=5)
         
         ctk.CTkLabel(edit_window, text="Descrição:").grid(row=1, column=0, padx=5, pady=5)
         description_entry = ctk.CTkEntry(edit_window)
-        description_entry.insert(0, transaction[2])
+        description_entry.insert(0, transaction.description)
         description_entry.grid(row=1, column=1, padx=5, pady=5)
         
         ctk.CTkLabel(edit_window, text="Valor:").grid(row=2, column=0, padx=5, pady=5)
         amount_entry = ctk.CTkEntry(edit_window)
-        amount_entry.insert(0, str(transaction[3]))
+        amount_entry.insert(0, str(transaction.amount))
         amount_entry.grid(row=2, column=1, padx=5, pady=5)
         
-        type_var = ctk.StringVar(value=transaction[4])
+        type_var = ctk.StringVar(value=transaction.type)
         ctk.CTkRadioButton(edit_window, text="Receita", variable=type_var, value="Receita").grid(row=3, column=0, padx=5, pady=5)
         ctk.CTkRadioButton(edit_window, text="Despesa", variable=type_var, value="Despesa").grid(row=3, column=1, padx=5, pady=5)
         
@@ -241,26 +633,22 @@ class FinanceDashboard(ctk.CTk):
     def salvar_edicao(self, transaction_id, date, description, amount, type, window):
         """Salva as alterações da transação editada."""
         try:
-            amount = float(amount)
+            amount = Money.from_value(amount)
         except ValueError:
             messagebox.showerror("Erro", "Digite um valor válido!")
             return
         
-        self.controller.update_transaction(transaction_id, date, description, amount, type)
-        self.update_transactions_list()
-        self.update_resumo()
+        if self.controller.update_transaction(int(transaction_id), date, description, amount, type) is None:
+            messagebox.showerror("Erro", "Não foi possível atualizar a transação!")
+            return
         window.destroy()
 
     def remover_transacao(self):
-        """Remove a transação selecionada."""
-        selected_item = self.tree.selection()
-        if not selected_item:
+        """Remove as transações selecionadas em uma única transação do banco."""
+        selected_items = self.tree.selection()
+        if not selected_items:
             messagebox.showerror("Erro", "Selecione uma transação para remover!")
             return
         
-        # Obtém o ID da transação selecionada diretamente da tabela
-        transaction_id = self.tree.item(selected_item, "values")[4]  # ID está na última coluna
-        
-        self.controller.delete_transaction(transaction_id)
-        self.update_transactions_list()
-        self.update_resumo()
\ No newline at end of file
+        # Os itens da tabela são identificados pelo ID da transação
+        self.controller.delete_transactions(int(iid) for iid in selected_items)
\ No newline at end of file
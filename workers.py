@@ -0,0 +1,142 @@
+import itertools
+import queue
+import threading
+
+import instrumentation
+
+class BackgroundWorker:
+    """Executa consultas fora da thread do Tk e devolve os resultados a ela.
+
+    As tarefas rodam em uma thread própria, com o controlador obtido dentro
+    dessa thread; como ``FinancialController`` abre uma conexão de leitura
+    por thread, as consultas não disputam a conexão usada pela interface.
+    Os resultados voltam por uma fila lida periodicamente com ``after()``,
+    de modo que os callbacks sempre executam na thread do Tk.
+
+    Tarefas enviadas com a mesma chave são agrupadas: enquanto uma tarefa
+    aguarda execução, um novo envio com a mesma chave a substitui, e o
+    resultado de uma tarefa já em execução é descartado se outra com a mesma
+    chave tiver sido enviada depois dela.
+
+    Com ``synchronous=True`` não há thread: cada tarefa roda no próprio
+    ``submit``, e só a entrega do resultado continua passando pelo
+    ``after()``. É o modo para bancos em memória, cuja única conexão é
+    compartilhada por leituras e escritas (ver
+    ``database.ConnectionManager.reader``).
+    """
+
+    def __init__(self, widget, controller_factory, poll_interval=30, synchronous=False):
+        """Inicia a thread de trabalho.
+
+        Args:
+            widget: Widget Tk usado para agendar a entrega dos resultados.
+            controller_factory (callable): Retorna o controlador usado pela
+                thread de trabalho; é chamado dentro dessa thread.
+            poll_interval (int): Intervalo, em ms, de leitura dos resultados.
+            synchronous (bool): Se True, executa as tarefas na thread que as
+                envia, sem thread de trabalho.
+        """
+        self._widget = widget
+        self._controller_factory = controller_factory
+        self._poll_interval = poll_interval
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._generations = {}
+        # Gerações crescentes entre todas as chaves: uma chave cancelada e
+        # reenviada nunca repete a geração de uma tarefa ainda em execução
+        self._generation = itertools.count(1)
+        self._results = queue.Queue()
+        self._anonymous = itertools.count()
+        self._running = True
+        if synchronous:
+            self._thread = None
+            self._controller = controller_factory()
+        else:
+            self._thread = threading.Thread(target=self._run, name="BackgroundWorker", daemon=True)
+            self._thread.start()
+        self._poll_id = widget.after(poll_interval, self._poll)
+
+    def submit(self, key, func, callback=None, error_callback=None):
+        """Agenda ``func(controller)`` na thread de trabalho.
+
+        Args:
+            key (hashable): Chave de agrupamento; None para uma tarefa avulsa.
+            func (callable): Função que recebe o controlador da thread de
+                trabalho e retorna o resultado.
+            callback (callable, optional): Recebe o resultado na thread do Tk.
+            error_callback (callable, optional): Recebe a exceção na thread do
+                Tk caso ``func`` falhe; se omitido, o erro é impresso.
+        """
+        if key is None:
+            key = ("anonymous", next(self._anonymous))
+        with self._condition:
+            generation = next(self._generation)
+            self._generations[key] = generation
+            if self._thread is not None:
+                self._pending[key] = (generation, func, callback, error_callback)
+                self._condition.notify()
+                return
+        self._execute(self._controller, key, generation, func, callback, error_callback)
+
+    def cancel(self, key):
+        """Descarta a tarefa pendente e o resultado em andamento da chave."""
+        with self._condition:
+            self._pending.pop(key, None)
+            # Sem geração registrada, qualquer resultado da chave é descartado
+            self._generations.pop(key, None)
+
+    def shutdown(self):
+        """Encerra a thread de trabalho e a leitura de resultados."""
+        with self._condition:
+            self._running = False
+            self._pending.clear()
+            self._condition.notify()
+        try:
+            self._widget.after_cancel(self._poll_id)
+        except Exception:
+            pass
+
+    def _run(self):
+        controller = self._controller_factory()
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                # Tarefas saem na ordem em que suas chaves foram enviadas
+                key = next(iter(self._pending))
+                generation, func, callback, error_callback = self._pending.pop(key)
+            self._execute(controller, key, generation, func, callback, error_callback)
+
+    def _execute(self, controller, key, generation, func, callback, error_callback):
+        try:
+            name = key[0] if isinstance(key, tuple) else key
+            with instrumentation.timer(f"workers.{name}"):
+                result, error = func(controller), None
+        except Exception as e:
+            result, error = None, e
+        self._results.put((key, generation, result, error, callback, error_callback))
+
+    def _poll(self):
+        while True:
+            try:
+                key, generation, result, error, callback, error_callback = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._condition:
+                stale = self._generations.get(key) != generation
+                if not stale and key not in self._pending:
+                    del self._generations[key]
+            if stale:
+                instrumentation.count("workers.stale_results")
+                continue
+            if error is not None:
+                if error_callback is not None:
+                    error_callback(error)
+                else:
+                    print(f"Erro na tarefa em segundo plano: {error}")
+            elif callback is not None:
+                callback(result)
+        if self._running:
+            self._poll_id = self._widget.after(self._poll_interval, self._poll)